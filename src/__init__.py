@@ -1,3 +1,5 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
 from fastapi import FastAPI
 from src.books.routes import book_router
 from src.auth.routes import auth_router
@@ -5,13 +7,28 @@ from src.tags.routes import tag_router
 from src.reviews.routes import review_router
 from src.errors import register_error_handlers
 from src.middlewares import register_middlewares
+from src.db.main import async_session_maker
+from src.tags.cache import tag_cache, listen_for_tag_changes
 
 version = "v1"
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    async with async_session_maker() as session:
+        await tag_cache.load(session)
+    tag_listener = asyncio.create_task(listen_for_tag_changes())
+    yield
+    tag_listener.cancel()
+    with suppress(asyncio.CancelledError):
+        await tag_listener
+
+
 app = FastAPI(
     title="Bookly",
     description="A REST API for books.",
     version=version,
+    lifespan=lifespan,
 )
 
 register_error_handlers(app=app)
@@ -0,0 +1,49 @@
+import time
+from typing import Dict, Optional, Tuple
+from src.auth.schemas import UserSnapshotModel
+
+# Bounds how long another worker keeps serving a snapshot that update_user
+# has already dropped from Redis.
+USER_SNAPSHOT_LOCAL_TTL = 5
+USER_SNAPSHOT_LOCAL_SIZE = 10000
+
+
+class UserSnapshotCache:
+    """
+    Per-process layer in front of the user snapshots kept in Redis.
+    - Entries expire after USER_SNAPSHOT_LOCAL_TTL seconds; when full, expired
+      entries are dropped first and then the oldest ones.
+    """
+
+    def __init__(
+        self, ttl: float = USER_SNAPSHOT_LOCAL_TTL, size: int = USER_SNAPSHOT_LOCAL_SIZE
+    ) -> None:
+        self._ttl = ttl
+        self._size = size
+        self._entries: Dict[str, Tuple[float, UserSnapshotModel]] = {}
+
+    def get(self, user_uid) -> Optional[UserSnapshotModel]:
+        entry = self._entries.get(str(user_uid))
+        if entry is None:
+            return None
+        expires_at, snapshot = entry
+        if expires_at <= time.monotonic():
+            self._entries.pop(str(user_uid), None)
+            return None
+        return snapshot
+
+    def set(self, snapshot: UserSnapshotModel) -> None:
+        now = time.monotonic()
+        if len(self._entries) >= self._size:
+            self._entries = {
+                key: entry for key, entry in self._entries.items() if entry[0] > now
+            }
+            while len(self._entries) >= self._size:
+                self._entries.pop(next(iter(self._entries)))
+        self._entries[str(snapshot.uid)] = (now + self._ttl, snapshot)
+
+    def discard(self, user_uid) -> None:
+        self._entries.pop(str(user_uid), None)
+
+
+user_snapshot_cache = UserSnapshotCache()
@@ -1,13 +1,15 @@
 from fastapi.security import HTTPBearer
 from fastapi import Request, Depends
 from src.auth.utils import decode_jwt_token
+from src.config import Config
 from src.db.redis import is_token_in_blocklist
 from sqlmodel.ext.asyncio.session import AsyncSession
 from src.db.main import get_session
 from src.auth.service import UserService
 from typing import List
-from src.db.models import User
+from src.auth.schemas import UserSnapshotModel
 from src.errors import (
+    InvalidTokenError,
     RevokedTokenError,
     AccessTokenRequiredError,
     RefreshTokenRequiredError,
@@ -52,9 +54,20 @@ class RefreshTokenBearer(TokenBearer):
 async def get_current_user(
     token_details: dict = Depends(AccessTokenBearer()),
     session: AsyncSession = Depends(get_session),
-):
-    email = token_details["user"]["email"]
-    user = await user_service.get_user_by_email(email, session)
+) -> UserSnapshotModel:
+    claims = token_details["user"]
+    # Tokens issued before the claims were added still take the lookup path.
+    if Config.STATELESS_AUTH and "role" in claims and "is_verified" in claims:
+        return UserSnapshotModel(
+            uid=claims["user_uid"],
+            email=claims["email"],
+            role=claims["role"],
+            is_verified=claims["is_verified"],
+        )
+
+    user = await user_service.get_user_snapshot(claims["user_uid"], session)
+    if user is None:
+        raise InvalidTokenError()
     return user
 
 
@@ -62,7 +75,7 @@ class RoleChecker:
     def __init__(self, permitted_roles: List[str]) -> None:
         self.permitted_roles = permitted_roles
 
-    def __call__(self, current_user: User = Depends(get_current_user)) -> any:
+    def __call__(self, current_user: UserSnapshotModel = Depends(get_current_user)) -> any:
         if not current_user.is_verified:
             raise UserNotVerifiedError()
 
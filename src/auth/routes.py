@@ -16,13 +16,13 @@ from src.auth.utils import (
     generate_email_token,
     verify_email_token,
     generate_password_hash,
+    access_token_claims,
 )
 from datetime import timedelta, datetime
 from fastapi.responses import JSONResponse
 from src.auth.dependencies import (
     RefreshTokenBearer,
     AccessTokenBearer,
-    get_current_user,
     RoleChecker,
 )
 from src.db.redis import add_token_to_blocklist
@@ -30,6 +30,7 @@ from src.errors import (
     UserAlreadyExistsError,
     InvalidCredentialsError,
     ExpiredTokenError,
+    InvalidTokenError,
     UserNotFoundError,
 )
 from src.config import Config
@@ -105,13 +106,7 @@ async def login(
         is_valid_password = verify_password(password, user.password_hash)
 
         if is_valid_password:
-            access_token = create_jwt_token(
-                user_data={
-                    "email": user.email,
-                    "user_uid": str(user.uid),
-                    "role": user.role,
-                }
-            )
+            access_token = create_jwt_token(user_data=access_token_claims(user))
 
             refresh_token = create_jwt_token(
                 user_data={"email": user.email, "user_uid": str(user.uid)},
@@ -132,19 +127,33 @@ async def login(
 
 
 @auth_router.get("/refresh-token")
-async def get_new_access_token(token_details: dict = Depends(refresh_token_bearer)):
+async def get_new_access_token(
+    token_details: dict = Depends(refresh_token_bearer),
+    session: AsyncSession = Depends(get_session),
+):
     expiry_time = token_details["exp"]
 
     if datetime.fromtimestamp(expiry_time) > datetime.now():
-        new_access_token = create_jwt_token(token_details["user"])
+        # Claims come from the current user record, not the refresh token, so
+        # role and verification changes reach the next access token.
+        user = await user_service.get_user_snapshot(
+            token_details["user"]["user_uid"], session
+        )
+        if user is None:
+            raise InvalidTokenError()
+        new_access_token = create_jwt_token(access_token_claims(user))
         return JSONResponse(content={"access_token": new_access_token})
     raise ExpiredTokenError()
 
 
 @auth_router.get("/me", response_model=UserBooksModel)
 async def get_current_user(
-    user=Depends(get_current_user), _: bool = Depends(role_checker)
+    token_details: dict = Depends(access_token_bearer),
+    _: bool = Depends(role_checker),
+    session: AsyncSession = Depends(get_session),
 ):
+    email = token_details["user"]["email"]
+    user = await user_service.get_user_with_relations(email, session)
     return user
 
 
@@ -17,6 +17,13 @@ class UserModel(BaseModel):
     updated_at: datetime
 
 
+class UserSnapshotModel(BaseModel):
+    uid: uuid.UUID
+    email: str
+    role: str
+    is_verified: bool
+
+
 class UserSignupModel(BaseModel):
     first_name: str = Field(min_length=2, max_length=50)
     last_name: str = Field(min_length=2, max_length=50)
@@ -1,15 +1,63 @@
 from src.db.models import User
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlmodel import select
-from src.auth.schemas import UserSignupModel
+from sqlalchemy.orm import selectinload
+from src.auth.schemas import UserSignupModel, UserSnapshotModel
 from src.auth.utils import generate_password_hash
+from src.auth.cache import user_snapshot_cache
+from src.db.redis import (
+    get_cached_user_snapshot,
+    cache_user_snapshot,
+    invalidate_user_snapshot,
+)
+from typing import Optional
 
 class UserService:
     async def get_user_by_email(self, email: str, session: AsyncSession):
         statement = select(User).where(User.email == email)
         result = await session.exec(statement)
         return result.first()
+
+    async def get_user_with_relations(self, email: str, session: AsyncSession):
+        statement = (
+            select(User)
+            .options(selectinload(User.books), selectinload(User.reviews))
+            .where(User.email == email)
+        )
+        result = await session.exec(statement)
+        return result.first()
     
+    async def get_user_snapshot(
+        self, user_uid: str, session: AsyncSession
+    ) -> Optional[UserSnapshotModel]:
+        """
+        Fetch the fields authorization needs, for every authenticated request.
+        - Looked up in this process, then Redis, then Postgres with a lean
+          column select that never touches the user's books or reviews.
+        """
+        snapshot = user_snapshot_cache.get(user_uid)
+        if snapshot is not None:
+            return snapshot
+
+        payload = await get_cached_user_snapshot(user_uid)
+        if payload is not None:
+            snapshot = UserSnapshotModel.model_validate_json(payload)
+            user_snapshot_cache.set(snapshot)
+            return snapshot
+
+        statement = select(User.uid, User.email, User.role, User.is_verified).where(
+            User.uid == user_uid
+        )
+        result = await session.exec(statement)
+        row = result.first()
+        if row is None:
+            return None
+
+        snapshot = UserSnapshotModel.model_validate(row, from_attributes=True)
+        await cache_user_snapshot(user_uid, snapshot.model_dump_json())
+        user_snapshot_cache.set(snapshot)
+        return snapshot
+
     async def is_user_exist(self, email: str, session: AsyncSession):
         user = await self.get_user_by_email(email, session)
         return True if user is not None else False
@@ -27,4 +75,6 @@ class UserService:
         for key, value in updated_data.items():
             setattr(user, key, value)
         await session.commit()
+        user_snapshot_cache.discard(user.uid)
+        await invalidate_user_snapshot(user.uid)
         return user
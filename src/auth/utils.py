@@ -35,6 +35,15 @@ def create_jwt_token(
     return token
 
 
+def access_token_claims(user) -> dict:
+    return {
+        "email": user.email,
+        "user_uid": str(user.uid),
+        "role": user.role,
+        "is_verified": user.is_verified,
+    }
+
+
 def decode_jwt_token(token: str) -> dict:
     try:
         return jwt.decode(
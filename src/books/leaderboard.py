@@ -0,0 +1,306 @@
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlmodel import select, func
+from sqlalchemy import extract
+from src.db.models import Book, Review
+from src.db.filters import uid_in
+from src.db.redis import redis_client
+from datetime import datetime, timedelta
+from typing import List, Optional
+import time
+import uuid
+
+TOP_RATED_KEY = "books:top_rated"
+TRENDING_KEY = "books:trending"
+TRENDING_EPOCH_KEY = "books:trending:epoch"
+RATING_STATS_KEY = "books:rating_stats"
+# While a rebuild runs, writers also journal what they change here so the
+# swap can replay it instead of losing it.
+REBUILD_FLAG_KEY = "books:leaderboards:rebuilding"
+PENDING_BOOKS_KEY = "books:leaderboards:pending_books"
+PENDING_REVIEWS_KEY = "books:leaderboards:pending_reviews"
+PENDING_STATS_KEY = "books:leaderboards:pending_stats"
+# Clears the flag should a rebuild die before the swap.
+REBUILD_FLAG_EXPIRY = 15 * 60
+
+# Number of "average" votes every book starts with in the Bayesian average.
+BAYESIAN_PRIOR_WEIGHT = 10
+# A review's contribution to the trending score halves over this many seconds.
+TRENDING_HALF_LIFE = 24 * 3600
+# Reviews older than this add (almost) nothing and are skipped on rebuild.
+TRENDING_WINDOW = timedelta(days=14)
+REBUILD_BATCH_SIZE = 1000
+
+
+def bayesian_average(review_count: int, rating_sum: int, mean_rating: float) -> float:
+    return (BAYESIAN_PRIOR_WEIGHT * mean_rating + rating_sum) / (
+        BAYESIAN_PRIOR_WEIGHT + review_count
+    )
+
+
+def mean_rating(total_count: int, total_sum: int) -> float:
+    return total_sum / total_count if total_count > 0 else 0.0
+
+
+async def record_rating_change(
+    book_uid,
+    review_count: int,
+    rating_sum: int,
+    count_delta: int,
+    sum_delta: int,
+) -> None:
+    """
+    Refresh a book's top-rated score after a review write.
+    - `review_count` and `rating_sum` are the book's values after the write.
+    - The global mean used as the prior is kept in Redis and moved by the deltas;
+      other books' scores pick up the new mean on the next rebuild.
+    """
+    async with redis_client.pipeline(transaction=False) as pipe:
+        pipe.hincrby(RATING_STATS_KEY, "count", count_delta)
+        pipe.hincrby(RATING_STATS_KEY, "sum", sum_delta)
+        pipe.exists(REBUILD_FLAG_KEY)
+        total_count, total_sum, rebuilding = await pipe.execute()
+
+    async with redis_client.pipeline(transaction=False) as pipe:
+        if review_count > 0:
+            score = bayesian_average(
+                review_count, rating_sum, mean_rating(total_count, total_sum)
+            )
+            pipe.zadd(TOP_RATED_KEY, {str(book_uid): score})
+        else:
+            pipe.zrem(TOP_RATED_KEY, str(book_uid))
+        if rebuilding:
+            journal_changes(pipe, [book_uid], count_delta, sum_delta)
+        await pipe.execute()
+
+
+async def record_rating_changes(
+    aggregates: List[tuple], count_delta: int, sum_delta: int
+) -> None:
+    """
+    Batch form of `record_rating_change` for bulk review writes.
+    - `aggregates` holds (book_uid, review_count, rating_sum) after the write;
+      the deltas are the totals over all of those books.
+    """
+    async with redis_client.pipeline(transaction=False) as pipe:
+        pipe.hincrby(RATING_STATS_KEY, "count", count_delta)
+        pipe.hincrby(RATING_STATS_KEY, "sum", sum_delta)
+        pipe.exists(REBUILD_FLAG_KEY)
+        total_count, total_sum, rebuilding = await pipe.execute()
+
+    mean = mean_rating(total_count, total_sum)
+    async with redis_client.pipeline(transaction=False) as pipe:
+        for book_uid, review_count, rating_sum in aggregates:
+            if review_count > 0:
+                pipe.zadd(
+                    TOP_RATED_KEY,
+                    {str(book_uid): bayesian_average(review_count, rating_sum, mean)},
+                )
+            else:
+                pipe.zrem(TOP_RATED_KEY, str(book_uid))
+        if rebuilding:
+            book_uids = [book_uid for book_uid, _, _ in aggregates]
+            journal_changes(pipe, book_uids, count_delta, sum_delta)
+        await pipe.execute()
+
+
+async def record_new_review(book_uid) -> None:
+    """
+    Bump a book's trending score for a review written now.
+    - Scores are sums of 2 ** ((t - epoch) / half_life); growing the weight of
+      new reviews is equivalent to decaying old ones and needs no background decay.
+    """
+    now = time.time()
+    async with redis_client.pipeline(transaction=False) as pipe:
+        pipe.set(TRENDING_EPOCH_KEY, now, nx=True)
+        pipe.get(TRENDING_EPOCH_KEY)
+        pipe.exists(REBUILD_FLAG_KEY)
+        _, epoch, rebuilding = await pipe.execute()
+
+    weight = 2 ** ((now - float(epoch)) / TRENDING_HALF_LIFE)
+    async with redis_client.pipeline(transaction=False) as pipe:
+        pipe.zincrby(TRENDING_KEY, weight, str(book_uid))
+        if rebuilding:
+            pipe.rpush(PENDING_REVIEWS_KEY, f"{book_uid} {now}")
+        await pipe.execute()
+
+
+async def remove_books(removed: List[tuple]) -> None:
+    """
+    Drop deleted books from both leaderboards.
+    - `removed` holds (book_uid, review_count, rating_sum) as they were before
+      the delete; their reviews leave the global mean with them.
+    """
+    if not removed:
+        return
+
+    members = [str(book_uid) for book_uid, _, _ in removed]
+    count_delta = -sum(review_count for _, review_count, _ in removed)
+    sum_delta = -sum(rating_sum for _, _, rating_sum in removed)
+    async with redis_client.pipeline(transaction=False) as pipe:
+        pipe.zrem(TOP_RATED_KEY, *members)
+        pipe.zrem(TRENDING_KEY, *members)
+        pipe.hincrby(RATING_STATS_KEY, "count", count_delta)
+        pipe.hincrby(RATING_STATS_KEY, "sum", sum_delta)
+        pipe.exists(REBUILD_FLAG_KEY)
+        *_, rebuilding = await pipe.execute()
+
+    if rebuilding:
+        async with redis_client.pipeline(transaction=False) as pipe:
+            journal_changes(pipe, members, count_delta, sum_delta)
+            await pipe.execute()
+
+
+def journal_changes(pipe, book_uids: List, count_delta: int, sum_delta: int) -> None:
+    if book_uids:
+        pipe.sadd(PENDING_BOOKS_KEY, *(str(book_uid) for book_uid in book_uids))
+    pipe.hincrby(PENDING_STATS_KEY, "count", count_delta)
+    pipe.hincrby(PENDING_STATS_KEY, "sum", sum_delta)
+
+
+async def get_ranked_book_uids(key: str, limit: int) -> List[str]:
+    members = await redis_client.zrevrange(key, 0, limit - 1)
+    return [member.decode() for member in members]
+
+
+async def rebuild_leaderboards(session: AsyncSession) -> None:
+    """
+    Recompute both sorted sets from Postgres and swap them in atomically.
+    - The trending epoch is reset to now in the same MULTI as the swap, which
+      keeps the exponential weights small.
+    - Writes made while the staging keys fill are journaled by the writers and
+      replayed after the swap. A write whose row was committed just before the
+      rebuild started but recorded just after can be counted twice until the
+      next rebuild.
+    """
+    async with redis_client.pipeline(transaction=True) as pipe:
+        pipe.delete(PENDING_BOOKS_KEY, PENDING_REVIEWS_KEY, PENDING_STATS_KEY)
+        pipe.set(REBUILD_FLAG_KEY, 1, ex=REBUILD_FLAG_EXPIRY)
+        await pipe.execute()
+
+    totals = await session.exec(
+        select(
+            func.coalesce(func.sum(Book.review_count), 0),
+            func.coalesce(func.sum(Book.rating_sum), 0),
+        )
+    )
+    total_count, total_sum = totals.one()
+    mean = mean_rating(total_count, total_sum)
+
+    top_rated = select(
+        Book.uid,
+        (BAYESIAN_PRIOR_WEIGHT * mean + Book.rating_sum)
+        / (BAYESIAN_PRIOR_WEIGHT + Book.review_count),
+    ).where(Book.review_count > 0)
+    top_rated_staging = await _stage_sorted_set(TOP_RATED_KEY, top_rated, session)
+
+    epoch = time.time()
+    epoch_at = datetime.fromtimestamp(epoch)
+    trending = (
+        select(
+            Review.book_uid,
+            func.sum(
+                func.power(
+                    2,
+                    extract("epoch", Review.created_at - epoch_at)
+                    / TRENDING_HALF_LIFE,
+                )
+            ),
+        )
+        .where(Review.book_uid.is_not(None))
+        .where(Review.created_at >= epoch_at - TRENDING_WINDOW)
+        .group_by(Review.book_uid)
+    )
+    trending_staging = await _stage_sorted_set(TRENDING_KEY, trending, session)
+
+    async with redis_client.pipeline(transaction=True) as pipe:
+        for key, staging_key in (
+            (TOP_RATED_KEY, top_rated_staging),
+            (TRENDING_KEY, trending_staging),
+        ):
+            if staging_key is not None:
+                pipe.rename(staging_key, key)
+            else:
+                pipe.delete(key)
+        pipe.set(TRENDING_EPOCH_KEY, epoch)
+        pipe.hset(RATING_STATS_KEY, mapping={"count": total_count, "sum": total_sum})
+        pipe.smembers(PENDING_BOOKS_KEY)
+        pipe.lrange(PENDING_REVIEWS_KEY, 0, -1)
+        pipe.hgetall(PENDING_STATS_KEY)
+        pipe.delete(
+            REBUILD_FLAG_KEY, PENDING_BOOKS_KEY, PENDING_REVIEWS_KEY, PENDING_STATS_KEY
+        )
+        *_, pending_books, pending_reviews, pending_stats, _ = await pipe.execute()
+
+    await _replay_pending(
+        session, epoch, pending_books, pending_reviews, pending_stats
+    )
+
+
+async def _replay_pending(
+    session: AsyncSession,
+    epoch: float,
+    pending_books: set,
+    pending_reviews: List[bytes],
+    pending_stats: dict,
+) -> None:
+    """Re-apply the changes journaled during a rebuild on top of the swapped-in keys."""
+    count_delta = int(pending_stats.get(b"count", 0))
+    sum_delta = int(pending_stats.get(b"sum", 0))
+    async with redis_client.pipeline(transaction=False) as pipe:
+        pipe.hincrby(RATING_STATS_KEY, "count", count_delta)
+        pipe.hincrby(RATING_STATS_KEY, "sum", sum_delta)
+        total_count, total_sum = await pipe.execute()
+
+    mean = mean_rating(total_count, total_sum)
+    book_uids = [uuid.UUID(member.decode()) for member in pending_books]
+    aggregates = {}
+    if book_uids:
+        # Scores are recomputed from current rows, which already include
+        # every journaled write.
+        result = await session.exec(
+            select(Book.uid, Book.review_count, Book.rating_sum).where(
+                uid_in(Book.uid, book_uids)
+            )
+        )
+        aggregates = {book_uid: row for book_uid, *row in result.all()}
+
+    removed = {str(book_uid) for book_uid in book_uids if book_uid not in aggregates}
+    async with redis_client.pipeline(transaction=False) as pipe:
+        for book_uid in book_uids:
+            if book_uid not in aggregates:
+                pipe.zrem(TOP_RATED_KEY, str(book_uid))
+                pipe.zrem(TRENDING_KEY, str(book_uid))
+            elif aggregates[book_uid][0] > 0:
+                pipe.zadd(
+                    TOP_RATED_KEY,
+                    {str(book_uid): bayesian_average(*aggregates[book_uid], mean)},
+                )
+            else:
+                pipe.zrem(TOP_RATED_KEY, str(book_uid))
+        for entry in pending_reviews:
+            book_uid, recorded_at = entry.decode().split()
+            # Reviews recorded before the trending query ran are in its result.
+            if book_uid in removed or float(recorded_at) < epoch:
+                continue
+            weight = 2 ** ((float(recorded_at) - epoch) / TRENDING_HALF_LIFE)
+            pipe.zincrby(TRENDING_KEY, weight, book_uid)
+        await pipe.execute()
+
+
+async def _stage_sorted_set(
+    key: str, statement, session: AsyncSession
+) -> Optional[str]:
+    staging_key = f"{key}:rebuild"
+    await redis_client.delete(staging_key)
+
+    rows = await session.stream(
+        statement.execution_options(yield_per=REBUILD_BATCH_SIZE)
+    )
+    staged = False
+    async for partition in rows.partitions(REBUILD_BATCH_SIZE):
+        await redis_client.zadd(
+            staging_key, {str(book_uid): float(score) for book_uid, score in partition}
+        )
+        staged = True
+
+    return staging_key if staged else None
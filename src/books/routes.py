@@ -1,26 +1,116 @@
-from fastapi import APIRouter, status, Depends
-from typing import List
-from src.books.schemas import BookModel, BookUpdateModel, BookCreateModel, BookDetailModel
+from fastapi import APIRouter, status, Depends, Query, Request, Header
+from fastapi.responses import StreamingResponse, Response
+from typing import List, Optional
+from src.books.schemas import (
+    BookModel,
+    BookUpdateModel,
+    BookCreateModel,
+    BookDetailModel,
+    BookPageModel,
+    BookSearchPageModel,
+    BookFilterModel,
+    BookImportResultModel,
+    BookBatchRequestModel,
+    BookBatchItemModel,
+    BookBulkPatchModel,
+    BookBulkDeleteModel,
+    BookBulkResultModel,
+)
 from sqlmodel.ext.asyncio.session import AsyncSession
 from src.db.main import get_session
 from src.books.service import BookService
 from src.auth.dependencies import AccessTokenBearer, RoleChecker
 from src.errors import BookNotFoundError
+from src.streaming import MEDIA_TYPES
+from src.db.redis import get_book_cache_stats
+from src.etag import etag_matches
+from src.books.leaderboard import (
+    TOP_RATED_KEY,
+    TRENDING_KEY,
+    get_ranked_book_uids,
+)
 
 book_router = APIRouter()
 book_service = BookService()
 access_token_bearer = AccessTokenBearer()
 role_checker = Depends(RoleChecker(["admin", "user"]))
+admin_role_checker = Depends(RoleChecker(["admin"]))
 
 
-@book_router.get("/", response_model=List[BookModel], dependencies=[role_checker])
+@book_router.get("/", response_model=BookPageModel, dependencies=[role_checker])
 async def get_all_books(
+    limit: int = Query(default=20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    facets: bool = False,
+    filters: BookFilterModel = Depends(),
+    session: AsyncSession = Depends(get_session),
+    token_details: dict = Depends(access_token_bearer),
+) -> dict:
+    books = await book_service.get_books(
+        session, limit=limit, cursor=cursor, filters=filters
+    )
+    if facets:
+        books["facets"] = await book_service.get_book_facets(session, filters=filters)
+    return books
+
+@book_router.get(
+    "/search", response_model=BookSearchPageModel, dependencies=[role_checker]
+)
+async def search_books(
+    q: str = Query(min_length=1, max_length=200),
+    limit: int = Query(default=20, ge=1, le=100),
+    cursor: Optional[str] = None,
     session: AsyncSession = Depends(get_session),
     token_details: dict = Depends(access_token_bearer),
 ) -> dict:
-    books = await book_service.get_books(session)
+    books = await book_service.search_books(q, session, limit=limit, cursor=cursor)
+    return books
+
+
+@book_router.get("/export", dependencies=[admin_role_checker])
+async def export_books(
+    fmt: str = Query(default="ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    token_details: dict = Depends(access_token_bearer),
+):
+    return StreamingResponse(
+        book_service.export_books(fmt),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="books.{fmt}"'},
+    )
+
+
+@book_router.get(
+    "/top-rated", response_model=List[BookModel], dependencies=[role_checker]
+)
+async def get_top_rated_books(
+    limit: int = Query(default=20, ge=1, le=100),
+    session: AsyncSession = Depends(get_session),
+    token_details: dict = Depends(access_token_bearer),
+):
+    book_uids = await get_ranked_book_uids(TOP_RATED_KEY, limit)
+    books = await book_service.get_books_by_uids(book_uids, session)
     return books
 
+
+@book_router.get(
+    "/trending", response_model=List[BookModel], dependencies=[role_checker]
+)
+async def get_trending_books(
+    limit: int = Query(default=20, ge=1, le=100),
+    session: AsyncSession = Depends(get_session),
+    token_details: dict = Depends(access_token_bearer),
+):
+    book_uids = await get_ranked_book_uids(TRENDING_KEY, limit)
+    books = await book_service.get_books_by_uids(book_uids, session)
+    return books
+
+
+@book_router.get("/cache-stats", dependencies=[admin_role_checker])
+async def get_cache_stats(token_details: dict = Depends(access_token_bearer)):
+    stats = await get_book_cache_stats()
+    return stats
+
+
 @book_router.get("/user/{user_uid}", response_model=List[BookModel], dependencies=[role_checker])
 async def get_current_user_books(
     user_uid: str,
@@ -34,15 +124,23 @@ async def get_current_user_books(
 @book_router.get("/{book_uid}", response_model=BookDetailModel, dependencies=[role_checker])
 async def get_book_by_uid(
     book_uid: str,
+    if_none_match: Optional[str] = Header(default=None),
     session: AsyncSession = Depends(get_session),
     token_details: dict = Depends(access_token_bearer),
 ) -> dict:
-    book = await book_service.get_book_by_uid(book_uid, session)
-    if book:
-        return book
-    else:
+    detail = await book_service.get_book_detail(book_uid, session, if_none_match)
+    if detail is None:
         raise BookNotFoundError()
 
+    etag, payload = detail
+    if payload is None or etag_matches(if_none_match, etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+        )
+    return Response(
+        content=payload, media_type="application/json", headers={"ETag": etag}
+    )
+
 @book_router.post(
     "/",
     status_code=status.HTTP_201_CREATED,
@@ -59,6 +157,58 @@ async def create_book(
     return new_book
 
 
+@book_router.post(
+    "/batch", response_model=List[BookBatchItemModel], dependencies=[role_checker]
+)
+async def get_books_batch(
+    batch: BookBatchRequestModel,
+    session: AsyncSession = Depends(get_session),
+    token_details: dict = Depends(access_token_bearer),
+):
+    payload = await book_service.get_book_batch_payload(batch.uids, session)
+    return Response(content=payload, media_type="application/json")
+
+
+@book_router.post(
+    "/import",
+    response_model=BookImportResultModel,
+    dependencies=[admin_role_checker],
+)
+async def import_books(
+    request: Request,
+    fmt: str = Query(default="ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    session: AsyncSession = Depends(get_session),
+    token_details: dict = Depends(access_token_bearer),
+) -> dict:
+    user_uid = token_details.get("user")["user_uid"]
+    summary = await book_service.import_books(
+        request.stream(), fmt, user_uid, session
+    )
+    return summary
+
+
+@book_router.patch(
+    "/bulk", response_model=BookBulkResultModel, dependencies=[admin_role_checker]
+)
+async def bulk_update_books(
+    bulk_data: BookBulkPatchModel,
+    session: AsyncSession = Depends(get_session),
+    token_details: dict = Depends(access_token_bearer),
+) -> dict:
+    return await book_service.bulk_update_books(bulk_data, session)
+
+
+@book_router.delete(
+    "/bulk", response_model=BookBulkResultModel, dependencies=[admin_role_checker]
+)
+async def bulk_delete_books(
+    bulk_data: BookBulkDeleteModel,
+    session: AsyncSession = Depends(get_session),
+    token_details: dict = Depends(access_token_bearer),
+) -> dict:
+    return await book_service.bulk_delete_books(bulk_data.uids, session)
+
+
 @book_router.patch("/{book_uid}", response_model=BookModel, dependencies=[role_checker])
 async def update_book_detail(
     book_uid: str,
@@ -1,7 +1,7 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
 import uuid
 from datetime import datetime, date
-from typing import List
+from typing import Dict, List, Optional
 from src.reviews.schemas import ReviewModel
 from src.tags.schemas import TagModel
 
@@ -14,13 +14,53 @@ class BookModel(BaseModel):
     page_count: int
     genre: str
     price: float
+    review_count: int
+    average_rating: Optional[float]
     created_at: datetime
     updated_at: datetime
 
+class BookFilterModel(BaseModel):
+    genre: Optional[str] = None
+    author: Optional[str] = None
+    user_uid: Optional[uuid.UUID] = None
+    tag: Optional[str] = None
+    min_price: Optional[float] = Field(default=None, ge=0)
+    max_price: Optional[float] = Field(default=None, ge=0)
+    published_from: Optional[date] = None
+    published_to: Optional[date] = None
+
+class BookFacetsModel(BaseModel):
+    genres: Dict[str, int]
+    tags: Dict[str, int]
+
+class BookPageModel(BaseModel):
+    items: List[BookModel]
+    next_cursor: Optional[str]
+    facets: Optional[BookFacetsModel] = None
+
+class BookSearchResultModel(BookModel):
+    rank: float
+
+class BookSearchPageModel(BaseModel):
+    items: List[BookSearchResultModel]
+    next_cursor: Optional[str]
+
 class BookDetailModel(BookModel):
+    rating_histogram: Dict[int, int]
     reviews: List[ReviewModel]
+    reviews_next_cursor: Optional[str]
     tags: List[TagModel]
 
+BOOK_BATCH_LIMIT = 100
+
+class BookBatchRequestModel(BaseModel):
+    uids: List[uuid.UUID] = Field(min_length=1, max_length=BOOK_BATCH_LIMIT)
+
+class BookBatchItemModel(BaseModel):
+    uid: uuid.UUID
+    found: bool
+    book: Optional[BookDetailModel]
+
 class BookCreateModel(BaseModel):
     title: str
     author: str
@@ -30,10 +70,61 @@ class BookCreateModel(BaseModel):
     genre: str
     price: float
 
+class BookImportErrorModel(BaseModel):
+    row: int
+    errors: List[str]
+
+class BookImportResultModel(BaseModel):
+    imported: int
+    failed: int
+    errors: List[BookImportErrorModel]
+    errors_truncated: bool
+
 class BookUpdateModel(BaseModel):
     title: str
     author: str
     publisher: str
     page_count: int
     genre: str
-    price: float
\ No newline at end of file
+    price: float
+
+BOOK_BULK_LIMIT = 10000
+
+class BookPatchModel(BaseModel):
+    title: Optional[str] = None
+    author: Optional[str] = None
+    publisher: Optional[str] = None
+    page_count: Optional[int] = None
+    genre: Optional[str] = None
+    price: Optional[float] = None
+
+class BookBulkPatchItemModel(BookPatchModel):
+    uid: uuid.UUID
+
+class BookBulkPatchModel(BaseModel):
+    """
+    Either one change applied to every uid in `uids`, or per-book changes in `items`.
+    """
+    uids: List[uuid.UUID] = Field(default=[], max_length=BOOK_BULK_LIMIT)
+    changes: Optional[BookPatchModel] = None
+    items: List[BookBulkPatchItemModel] = Field(default=[], max_length=BOOK_BULK_LIMIT)
+
+    @model_validator(mode="after")
+    def check_shape(self):
+        if bool(self.items) == bool(self.uids):
+            raise ValueError("provide either uids with changes, or items")
+        if self.items and self.changes is not None:
+            raise ValueError("changes cannot be combined with items")
+        if self.uids and not (
+            self.changes and self.changes.model_dump(exclude_none=True)
+        ):
+            raise ValueError("changes must set at least one field")
+        return self
+
+class BookBulkDeleteModel(BaseModel):
+    uids: List[uuid.UUID] = Field(min_length=1, max_length=BOOK_BULK_LIMIT)
+
+class BookBulkResultModel(BaseModel):
+    requested: int
+    affected: int
+    not_found: List[uuid.UUID]
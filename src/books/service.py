@@ -1,16 +1,201 @@
 from sqlmodel.ext.asyncio.session import AsyncSession
-from src.books.schemas import BookCreateModel, BookUpdateModel
-from src.db.models import Book
-from sqlmodel import select, desc
+from src.books.schemas import (
+    BookModel,
+    BookDetailModel,
+    BookCreateModel,
+    BookUpdateModel,
+    BookSearchResultModel,
+    BookFilterModel,
+    BookBulkPatchModel,
+    BookPatchModel,
+)
+from src.db.models import Book, BookTag, Tag, Review
+from src.db.pagination import encode_cursor, decode_cursor
+from src.db.filters import uid_in
+from src.db.main import async_session_maker
+from src.db.redis import (
+    get_cached_book,
+    get_cached_books,
+    cache_book,
+    cache_books,
+    invalidate_cached_books,
+)
+from src.books.leaderboard import remove_books
+from src.reviews.service import ReviewService
+from src.tags.service import unlink_books
+from src.tags.cache import publish_tag_change
+from src.streaming import iter_validated_batches, iter_encoded
+from src.etag import make_etag, etag_matches
+from sqlmodel import select, desc, func, insert, update, delete
+from sqlalchemy import tuple_, values, column, cast
+import sqlalchemy.dialects.postgresql as pg
+from sqlalchemy.orm import selectinload
 from datetime import datetime
+from typing import AsyncIterator, List, Optional, Tuple
 import uuid
 
+IMPORT_BATCH_SIZE = 1000
+EXPORT_BATCH_SIZE = 1000
+IMPORT_ERROR_LIMIT = 1000
+BULK_CHUNK_SIZE = 1000
+DETAIL_REVIEW_LIMIT = 20
+# Every write that changes a book's detail payload moves one of these.
+BOOK_VERSION_COLUMNS = (Book.uid, Book.updated_at, Book.review_count, Book.rating_sum)
+IMPORT_COLUMNS = [
+    "uid",
+    "title",
+    "author",
+    "publisher",
+    "published_date",
+    "page_count",
+    "genre",
+    "price",
+    "user_uid",
+    "created_at",
+    "updated_at",
+]
+
+
+def book_etag(version) -> str:
+    return make_etag(*(getattr(version, column.key) for column in BOOK_VERSION_COLUMNS))
+
+
+def apply_book_filters(statement, filters: Optional[BookFilterModel]):
+    if filters is None:
+        return statement
+
+    if filters.genre is not None:
+        statement = statement.where(Book.genre == filters.genre)
+    if filters.author is not None:
+        statement = statement.where(Book.author == filters.author)
+    if filters.user_uid is not None:
+        statement = statement.where(Book.user_uid == filters.user_uid)
+    if filters.min_price is not None:
+        statement = statement.where(Book.price >= filters.min_price)
+    if filters.max_price is not None:
+        statement = statement.where(Book.price <= filters.max_price)
+    if filters.published_from is not None:
+        statement = statement.where(Book.published_date >= filters.published_from)
+    if filters.published_to is not None:
+        statement = statement.where(Book.published_date <= filters.published_to)
+    if filters.tag is not None:
+        tagged_books = (
+            select(BookTag.book_id)
+            .join(Tag, Tag.uid == BookTag.tag_id)
+            .where(Tag.name == filters.tag)
+        )
+        statement = statement.where(Book.uid.in_(tagged_books))
+
+    return statement
+
+
+review_service = ReviewService()
+
 
 class BookService:
-    async def get_books(self, session: AsyncSession):
-        statement = select(Book).order_by(desc(Book.created_at))
+    async def get_books(
+        self,
+        session: AsyncSession,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        filters: Optional[BookFilterModel] = None,
+    ):
+        statement = (
+            select(Book)
+            .order_by(desc(Book.created_at), desc(Book.uid))
+            .limit(limit + 1)
+        )
+        statement = apply_book_filters(statement, filters)
+
+        if cursor is not None:
+            created_at, book_uid = decode_cursor(
+                cursor, datetime.fromisoformat, uuid.UUID
+            )
+            statement = statement.where(
+                tuple_(Book.created_at, Book.uid) < tuple_(created_at, book_uid)
+            )
+
         result = await session.exec(statement)
-        return result.all()
+        books = result.all()
+
+        next_cursor = None
+        if len(books) > limit:
+            books = books[:limit]
+            next_cursor = encode_cursor(books[-1].created_at, books[-1].uid)
+
+        return {"items": books, "next_cursor": next_cursor}
+
+    async def get_book_facets(
+        self, session: AsyncSession, filters: Optional[BookFilterModel] = None
+    ):
+        # Both facets come out of one pass over the filtered books: each
+        # grouping set produces its own rows, told apart by grouping().
+        statement = (
+            select(
+                Book.genre,
+                Tag.name,
+                func.count(func.distinct(Book.uid)),
+                func.grouping(Book.genre),
+            )
+            .select_from(Book)
+            .outerjoin(BookTag, BookTag.book_id == Book.uid)
+            .outerjoin(Tag, Tag.uid == BookTag.tag_id)
+            .group_by(func.grouping_sets(Book.genre, Tag.name))
+        )
+        statement = apply_book_filters(statement, filters)
+
+        result = await session.exec(statement)
+
+        facets = {"genres": {}, "tags": {}}
+        for genre, tag_name, count, genre_grouped in result.all():
+            if not genre_grouped:
+                facets["genres"][genre] = count
+            elif tag_name is not None:
+                facets["tags"][tag_name] = count
+        return facets
+
+    async def search_books(
+        self,
+        query: str,
+        session: AsyncSession,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+    ):
+        search_vector = Book.__table__.c.search_vector
+        ts_query = func.websearch_to_tsquery("english", query)
+        rank = func.ts_rank(search_vector, ts_query)
+
+        statement = (
+            select(Book, rank)
+            .where(search_vector.op("@@")(ts_query))
+            .order_by(desc(rank), desc(Book.uid))
+            .limit(limit + 1)
+        )
+
+        if cursor is not None:
+            last_rank, book_uid = decode_cursor(cursor, float, uuid.UUID)
+            statement = statement.where(
+                tuple_(rank, Book.uid) < tuple_(last_rank, book_uid)
+            )
+
+        result = await session.exec(statement)
+        rows = result.all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last_book, last_rank = rows[-1]
+            next_cursor = encode_cursor(last_rank, last_book.uid)
+
+        items = [
+            BookSearchResultModel(
+                **book.model_dump(),
+                average_rating=book.average_rating,
+                rank=book_rank,
+            )
+            for book, book_rank in rows
+        ]
+        return {"items": items, "next_cursor": next_cursor}
 
     async def get_book_by_uid(self, book_uid: str, session: AsyncSession):
         statement = select(Book).where(Book.uid == book_uid)
@@ -18,6 +203,134 @@ class BookService:
         book = result.first()
         return book if book is not None else None
 
+    async def get_book_details(
+        self, book_uids: List[uuid.UUID], session: AsyncSession
+    ) -> List[Tuple[str, BookDetailModel]]:
+        """
+        Build (etag, detail model) pairs for the books in `book_uids` that exist.
+        - Reviews are limited to the newest page per book; the rest is reached
+          through `reviews_next_cursor` on GET /reviews/book/{book_uid}.
+        - Tags are sorted by name so equal books serialize identically.
+        """
+        statement = (
+            select(Book)
+            .options(selectinload(Book.tags))
+            .where(uid_in(Book.uid, book_uids))
+        )
+        result = await session.exec(statement)
+        books = result.all()
+        if not books:
+            return []
+
+        review_pages = await review_service.get_first_review_pages(
+            [book.uid for book in books], session, DETAIL_REVIEW_LIMIT
+        )
+        return [
+            (
+                book_etag(book),
+                BookDetailModel.model_validate(
+                    {
+                        **BookModel.model_validate(
+                            book, from_attributes=True
+                        ).model_dump(),
+                        "rating_histogram": book.rating_histogram,
+                        "tags": sorted(book.tags, key=lambda tag: tag.name),
+                        "reviews": review_pages[book.uid]["items"],
+                        "reviews_next_cursor": review_pages[book.uid]["next_cursor"],
+                    },
+                    from_attributes=True,
+                ),
+            )
+            for book in books
+        ]
+
+    async def get_book_detail(
+        self,
+        book_uid: str,
+        session: AsyncSession,
+        if_none_match: Optional[str] = None,
+    ) -> Optional[Tuple[str, Optional[str]]]:
+        """
+        Return (etag, payload) for a book, or None if it does not exist.
+        - A cache hit needs no query. On a miss, a conditional request first
+          checks the version columns and gets a None payload when the client's
+          copy is current, without loading tags or reviews.
+        """
+        try:
+            book_uuid = uuid.UUID(book_uid)
+        except ValueError:
+            return None
+
+        cached = await get_cached_book(book_uid)
+        if cached is not None:
+            return cached
+
+        if if_none_match:
+            statement = select(*BOOK_VERSION_COLUMNS).where(Book.uid == book_uuid)
+            result = await session.exec(statement)
+            version = result.first()
+            if version is None:
+                return None
+            etag = book_etag(version)
+            if etag_matches(if_none_match, etag):
+                return etag, None
+
+        details = await self.get_book_details([book_uuid], session)
+        if not details:
+            return None
+
+        etag, detail = details[0]
+        payload = detail.model_dump_json()
+        await cache_book(book_uid, etag, payload)
+        return etag, payload
+
+    async def get_book_batch_payload(
+        self, book_uids: List[uuid.UUID], session: AsyncSession
+    ) -> str:
+        """
+        Resolve many book details at once and return them as a JSON array.
+        - Order follows `book_uids`; unknown uids are returned with found=false.
+        - Cached payloads are spliced in as-is; all misses are loaded together.
+        """
+        unique_uids = list(dict.fromkeys(book_uids))
+        cached = await get_cached_books(unique_uids)
+        payloads = {
+            book_uid: payload
+            for book_uid, payload in zip(unique_uids, cached)
+            if payload is not None
+        }
+
+        missing_uids = [book_uid for book_uid in unique_uids if book_uid not in payloads]
+        if missing_uids:
+            details = await self.get_book_details(missing_uids, session)
+            loaded = {
+                detail.uid: (etag, detail.model_dump_json()) for etag, detail in details
+            }
+            await cache_books(loaded)
+            payloads.update(
+                (book_uid, payload) for book_uid, (_, payload) in loaded.items()
+            )
+
+        items = []
+        for book_uid in book_uids:
+            payload = payloads.get(book_uid)
+            if payload is None:
+                items.append(f'{{"uid":"{book_uid}","found":false,"book":null}}')
+            else:
+                items.append(f'{{"uid":"{book_uid}","found":true,"book":{payload}}}')
+        return f"[{','.join(items)}]"
+
+    async def get_books_by_uids(self, book_uids: List[str], session: AsyncSession):
+        """Fetch books with one `uid = ANY(...)` query, returned in the given order."""
+        uuids = [uuid.UUID(book_uid) for book_uid in book_uids]
+        if not uuids:
+            return []
+
+        statement = select(Book).where(uid_in(Book.uid, uuids))
+        result = await session.exec(statement)
+        books = {book.uid: book for book in result.all()}
+        return [books[book_uuid] for book_uuid in uuids if book_uuid in books]
+
     async def get_user_books(self, user_uid: str, session: AsyncSession):
         user_uuid = uuid.UUID(user_uid)
 
@@ -45,25 +358,260 @@ class BookService:
     async def update_book(
         self, book_uid: str, updated_book_data: BookUpdateModel, session: AsyncSession
     ):
-        book_to_update = await self.get_book_by_uid(book_uid, session)
+        statement = (
+            update(Book)
+            .where(Book.uid == book_uid)
+            .values(**updated_book_data.model_dump(), updated_at=datetime.now())
+            .returning(Book)
+            .execution_options(synchronize_session=False)
+        )
+        result = await session.exec(statement)
+        book = result.scalars().first()
+        if book is None:
+            return None
 
-        if book_to_update is not None:
-            updated_book_data_dic = updated_book_data.model_dump()
+        await session.commit()
+        await invalidate_cached_books(book_uid)
+        return book
 
-            for key, value in updated_book_data_dic.items():
-                setattr(book_to_update, key, value)
+    async def delete_book(self, book_uid: str, session: AsyncSession):
+        # Same effect as the ORM delete this replaces: tag links go away and
+        # the book's reviews are kept with book_uid cleared.
+        unlinked = await unlink_books([book_uid], session)
+        await session.exec(
+            update(Review)
+            .where(Review.book_uid == book_uid)
+            .values(book_uid=None, updated_at=datetime.now())
+            .execution_options(synchronize_session=False)
+        )
+        result = await session.exec(
+            delete(Book)
+            .where(Book.uid == book_uid)
+            .returning(Book.uid, Book.review_count, Book.rating_sum)
+            .execution_options(synchronize_session=False)
+        )
+        deleted = result.first()
+        if deleted is None:
+            await session.rollback()
+            return None
+
+        await session.commit()
+        if unlinked:
+            await publish_tag_change()
+        await invalidate_cached_books(deleted.uid)
+        await remove_books([deleted])
+        return {}
 
-            await session.commit()
-            return book_to_update
+    async def bulk_update_books(
+        self, bulk_data: BookBulkPatchModel, session: AsyncSession
+    ) -> dict:
+        """
+        Apply a bulk patch with one UPDATE per chunk of books.
+        - Shared changes are a plain UPDATE ... WHERE uid = ANY(...).
+        - Per-book changes are joined in from a VALUES list; fields left out of
+          an item keep their stored value.
+        - All chunks commit together.
+        """
+        if bulk_data.items:
+            changes = {item.uid: item for item in bulk_data.items}
         else:
-            return None
+            changes = dict.fromkeys(bulk_data.uids, bulk_data.changes)
+        book_uids = list(changes)
+        now = datetime.now()
+        updated_uids = []
 
-    async def delete_book(self, book_uid: str, session: AsyncSession):
-        book_to_delete = await self.get_book_by_uid(book_uid, session)
+        for start in range(0, len(book_uids), BULK_CHUNK_SIZE):
+            chunk = book_uids[start : start + BULK_CHUNK_SIZE]
+
+            if bulk_data.items:
+                rows = values(
+                    column("uid", pg.UUID(as_uuid=True)),
+                    *(
+                        column(name, Book.__table__.c[name].type)
+                        for name in BookPatchModel.model_fields
+                    ),
+                    name="changes",
+                ).data(
+                    [
+                        (book_uid, *changes[book_uid].model_dump(exclude={"uid"}).values())
+                        for book_uid in chunk
+                    ]
+                )
+                statement = (
+                    update(Book)
+                    .where(Book.uid == rows.c.uid)
+                    .values(
+                        {
+                            # Untyped NULLs in VALUES come back as text.
+                            name: func.coalesce(
+                                cast(rows.c[name], Book.__table__.c[name].type),
+                                Book.__table__.c[name],
+                            )
+                            for name in BookPatchModel.model_fields
+                        }
+                        | {"updated_at": now}
+                    )
+                )
+            else:
+                statement = (
+                    update(Book)
+                    .where(uid_in(Book.uid, chunk))
+                    .values(
+                        **bulk_data.changes.model_dump(exclude_none=True),
+                        updated_at=now,
+                    )
+                )
+
+            result = await session.exec(
+                statement.returning(Book.uid).execution_options(
+                    synchronize_session=False
+                )
+            )
+            updated_uids.extend(result.scalars().all())
+
+        await session.commit()
+        await invalidate_cached_books(*updated_uids)
+        return self._bulk_result(book_uids, updated_uids)
+
+    async def bulk_delete_books(
+        self, book_uids: List[uuid.UUID], session: AsyncSession
+    ) -> dict:
+        """
+        Delete many books with set-based statements per chunk.
+        - Tag links are removed and reviews detached, as in delete_book.
+        - All chunks commit together.
+        """
+        book_uids = list(dict.fromkeys(book_uids))
+        deleted = []
+        unlinked = False
+        now = datetime.now()
+
+        for start in range(0, len(book_uids), BULK_CHUNK_SIZE):
+            chunk = book_uids[start : start + BULK_CHUNK_SIZE]
+            if await unlink_books(chunk, session):
+                unlinked = True
+            await session.exec(
+                update(Review)
+                .where(uid_in(Review.book_uid, chunk))
+                .values(book_uid=None, updated_at=now)
+                .execution_options(synchronize_session=False)
+            )
+            result = await session.exec(
+                delete(Book)
+                .where(uid_in(Book.uid, chunk))
+                .returning(Book.uid, Book.review_count, Book.rating_sum)
+                .execution_options(synchronize_session=False)
+            )
+            deleted.extend(result.all())
+
+        deleted_uids = [row.uid for row in deleted]
+        await session.commit()
+        if unlinked:
+            await publish_tag_change()
+        await invalidate_cached_books(*deleted_uids)
+        await remove_books(deleted)
+        return self._bulk_result(book_uids, deleted_uids)
+
+    def _bulk_result(self, book_uids: List[uuid.UUID], affected_uids: List) -> dict:
+        affected = set(affected_uids)
+        return {
+            "requested": len(book_uids),
+            "affected": len(affected),
+            "not_found": [book_uid for book_uid in book_uids if book_uid not in affected],
+        }
 
-        if book_to_delete is not None:
-            await session.delete(book_to_delete)
-            await session.commit()
-            return {}
+    async def import_books(
+        self,
+        chunks: AsyncIterator[bytes],
+        fmt: str,
+        user_uid: str,
+        session: AsyncSession,
+    ):
+        owner_uid = uuid.UUID(user_uid)
+        summary = {"imported": 0, "failed": 0, "errors": [], "errors_truncated": False}
+
+        def record_errors(errors: List[dict]):
+            summary["failed"] += len(errors)
+            room = IMPORT_ERROR_LIMIT - len(summary["errors"])
+            summary["errors"].extend(errors[:room])
+            if len(errors) > room:
+                summary["errors_truncated"] = True
+
+        async for valid_rows, errors in iter_validated_batches(
+            chunks, fmt, BookCreateModel, batch_size=IMPORT_BATCH_SIZE
+        ):
+            records = []
+            record_rows = []
+            for row_number, book_data in valid_rows:
+                try:
+                    published_date = datetime.strptime(
+                        book_data.published_date, "%Y-%m-%d"
+                    ).date()
+                except ValueError:
+                    errors.append(
+                        {
+                            "row": row_number,
+                            "errors": ["published_date: expected YYYY-MM-DD"],
+                        }
+                    )
+                    continue
+
+                now = datetime.now()
+                records.append(
+                    (
+                        uuid.uuid4(),
+                        book_data.title,
+                        book_data.author,
+                        book_data.publisher,
+                        published_date,
+                        book_data.page_count,
+                        book_data.genre,
+                        book_data.price,
+                        owner_uid,
+                        now,
+                        now,
+                    )
+                )
+                record_rows.append(row_number)
+
+            if records:
+                try:
+                    await self._copy_books(records, session)
+                    await session.commit()
+                    summary["imported"] += len(records)
+                except Exception as exc:
+                    await session.rollback()
+                    errors.extend(
+                        {"row": row_number, "errors": [f"database error: {exc}"]}
+                        for row_number in record_rows
+                    )
+
+            record_errors(sorted(errors, key=lambda error: error["row"]))
+
+        return summary
+
+    async def _copy_books(self, records: List[tuple], session: AsyncSession):
+        connection = await session.connection()
+        raw_connection = await connection.get_raw_connection()
+        driver_connection = raw_connection.driver_connection
+
+        if hasattr(driver_connection, "copy_records_to_table"):
+            await driver_connection.copy_records_to_table(
+                Book.__tablename__, records=records, columns=IMPORT_COLUMNS
+            )
         else:
-            return None
+            await session.exec(
+                insert(Book.__table__).values(
+                    [dict(zip(IMPORT_COLUMNS, record)) for record in records]
+                )
+            )
+
+    async def export_books(self, fmt: str) -> AsyncIterator[str]:
+        # The export outlives the request's dependencies, so it owns its session.
+        async with async_session_maker() as session:
+            statement = select(Book).execution_options(yield_per=EXPORT_BATCH_SIZE)
+            books = await session.stream_scalars(statement)
+            async for chunk in iter_encoded(
+                books.partitions(EXPORT_BATCH_SIZE), BookModel, fmt
+            ):
+                yield chunk
@@ -1,5 +1,8 @@
 from celery import Celery
 from src.mail import mail, create_message
+from src.db.main import async_engine, async_session_maker
+from src.db.redis import redis_client
+from src.books.leaderboard import rebuild_leaderboards as rebuild_book_leaderboards
 from asgiref.sync import async_to_sync
 
 celery_app = Celery()
@@ -20,4 +23,20 @@ def send_email(
     if template_name:
         async_to_sync(mail.send_message)(message, template_name=template_name)
     else:
-        async_to_sync(mail.send_message)(message)
\ No newline at end of file
+        async_to_sync(mail.send_message)(message)
+
+
+async def _rebuild_leaderboards():
+    try:
+        async with async_session_maker() as session:
+            await rebuild_book_leaderboards(session)
+    finally:
+        # Each task runs on a fresh event loop; pooled connections must not
+        # outlive it.
+        await async_engine.dispose()
+        await redis_client.connection_pool.disconnect()
+
+
+@celery_app.task()
+def rebuild_leaderboards():
+    async_to_sync(_rebuild_leaderboards)()
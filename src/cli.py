@@ -0,0 +1,80 @@
+import argparse
+import asyncio
+from src.db.main import async_session_maker
+from src.books.service import BookService
+from src.reviews.service import ReviewService
+from src.tags.service import TagService
+
+FILE_CHUNK_SIZE = 64 * 1024
+
+book_service = BookService()
+review_service = ReviewService()
+tag_service = TagService()
+
+
+async def read_file_chunks(path: str):
+    with open(path, "rb") as file:
+        while chunk := file.read(FILE_CHUNK_SIZE):
+            yield chunk
+
+
+async def reconcile_ratings(args: argparse.Namespace):
+    async with async_session_maker() as session:
+        updated = await review_service.reconcile_rating_aggregates(session=session)
+    print(f"Rebuilt rating aggregates for {updated} book(s)")
+
+
+async def reconcile_tag_counts(args: argparse.Namespace):
+    async with async_session_maker() as session:
+        updated = await tag_service.reconcile_tag_counts(session=session)
+    print(f"Corrected book counts for {updated} tag(s)")
+
+
+async def import_books(args: argparse.Namespace):
+    async with async_session_maker() as session:
+        summary = await book_service.import_books(
+            read_file_chunks(args.path), args.format, args.user_uid, session
+        )
+
+    for error in summary["errors"]:
+        print(f"row {error['row']}: {'; '.join(error['errors'])}")
+    if summary["errors_truncated"]:
+        print("... further row errors omitted")
+    print(f"Imported {summary['imported']} book(s), {summary['failed']} row(s) failed")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="python -m src.cli", description="Bookly maintenance commands."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    reconcile_parser = subparsers.add_parser(
+        "reconcile-ratings",
+        help="Rebuild review counts and rating histograms on books from reviews",
+    )
+    reconcile_parser.set_defaults(handler=reconcile_ratings)
+
+    tag_counts_parser = subparsers.add_parser(
+        "reconcile-tag-counts", help="Rebuild tag book counts from the book_tags table"
+    )
+    tag_counts_parser.set_defaults(handler=reconcile_tag_counts)
+
+    import_parser = subparsers.add_parser(
+        "import-books", help="Bulk load books from a CSV or NDJSON file"
+    )
+    import_parser.add_argument("path", help="File to import")
+    import_parser.add_argument(
+        "--format", choices=["ndjson", "csv"], default="ndjson", help="File format"
+    )
+    import_parser.add_argument(
+        "--user-uid", required=True, help="uid of the user who will own the books"
+    )
+    import_parser.set_defaults(handler=import_books)
+
+    args = parser.parse_args()
+    asyncio.run(args.handler(args))
+
+
+if __name__ == "__main__":
+    main()
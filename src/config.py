@@ -17,6 +17,9 @@ class Settings(BaseSettings):
     VALIDATE_CERTS: bool = True
     DOMAIN: str
     EMAIL_TOKEN_SECRET: str
+    # Authorize from the role/is_verified claims in access tokens instead of
+    # looking the user up; role changes then apply when the token is renewed.
+    STATELESS_AUTH: bool = False
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -27,4 +30,10 @@ Config = Settings()
 
 broker_url = Config.REDIS_URL
 result_backend = Config.REDIS_URL
-broker_connection_retry_on_startup = True
\ No newline at end of file
+broker_connection_retry_on_startup = True
+beat_schedule = {
+    "rebuild-book-leaderboards": {
+        "task": "src.celery_tasks.rebuild_leaderboards",
+        "schedule": 15 * 60,
+    },
+}
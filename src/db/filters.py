@@ -0,0 +1,10 @@
+import uuid
+from typing import List
+from sqlalchemy import any_, literal
+import sqlalchemy.dialects.postgresql as pg
+
+
+def uid_in(column, uids: List[uuid.UUID]):
+    # A single array parameter keeps the statement (and its plan) the same
+    # whatever the number of uids, and stays clear of the bind parameter limit.
+    return column == any_(literal(uids, pg.ARRAY(pg.UUID(as_uuid=True))))
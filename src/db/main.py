@@ -10,11 +10,11 @@ async_engine = AsyncEngine(
     )
 )
 
+async_session_maker = sessionmaker(
+    bind=async_engine, class_=AsyncSession, expire_on_commit=False
+)
 
-async def get_session():
-    Session = sessionmaker(
-        bind=async_engine, class_=AsyncSession, expire_on_commit=False
-    )
 
-    async with Session() as session:
+async def get_session():
+    async with async_session_maker() as session:
         yield session
@@ -1,8 +1,9 @@
-from sqlmodel import SQLModel, Field, Column, Relationship
+from sqlmodel import SQLModel, Field, Column, Relationship, Index
 from datetime import datetime, date
 import sqlalchemy.dialects.postgresql as pg
+import sqlalchemy as sa
 import uuid
-from typing import Optional, List
+from typing import Optional, List, Dict
 
 
 class User(SQLModel, table=True):
@@ -23,10 +24,10 @@ class User(SQLModel, table=True):
     created_at: datetime = Field(sa_column=Column(pg.TIMESTAMP, default=datetime.now))
     updated_at: datetime = Field(sa_column=Column(pg.TIMESTAMP, default=datetime.now))
     books: List["Book"] = Relationship(
-        back_populates="user", sa_relationship_kwargs={"lazy": "selectin"}
+        back_populates="user", sa_relationship_kwargs={"lazy": "raise"}
     )
     reviews: List["Review"] = Relationship(
-        back_populates="user", sa_relationship_kwargs={"lazy": "selectin"}
+        back_populates="user", sa_relationship_kwargs={"lazy": "raise"}
     )
 
     def __repr__(self):
@@ -35,21 +36,36 @@ class User(SQLModel, table=True):
 
 class BookTag(SQLModel, table=True):
     __tablename__ = "book_tags"
+    __table_args__ = (Index("ix_book_tags_tag_id_book_id", "tag_id", "book_id"),)
     book_id: uuid.UUID = Field(default=None, foreign_key="books.uid", primary_key=True)
     tag_id: uuid.UUID = Field(default=None, foreign_key="tags.uid", primary_key=True)
 
 
 class Tag(SQLModel, table=True):
     __tablename__ = "tags"
+    __table_args__ = (
+        Index("ix_tags_name", "name", unique=True),
+        Index(
+            "ix_tags_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+    )
     uid: uuid.UUID = Field(
         sa_column=Column(pg.UUID, nullable=False, primary_key=True, default=uuid.uuid4)
     )
     name: str = Field(sa_column=Column(pg.VARCHAR, nullable=False))
+    # Number of books carrying the tag, kept in step with book_tags writes.
+    book_count: int = Field(
+        default=0,
+        sa_column=Column(pg.INTEGER, nullable=False, default=0, server_default="0"),
+    )
     created_at: datetime = Field(sa_column=Column(pg.TIMESTAMP, default=datetime.now))
     books: List["Book"] = Relationship(
         link_model=BookTag,
         back_populates="tags",
-        sa_relationship_kwargs={"lazy": "selectin"},
+        sa_relationship_kwargs={"lazy": "raise"},
     )
 
     def __repr__(self) -> str:
@@ -58,6 +74,24 @@ class Tag(SQLModel, table=True):
 
 class Book(SQLModel, table=True):
     __tablename__ = "books"
+    __table_args__ = (
+        Index("ix_books_created_at_uid", "created_at", "uid"),
+        Index("ix_books_genre_created_at_uid", "genre", "created_at", "uid"),
+        Index("ix_books_author_created_at_uid", "author", "created_at", "uid"),
+        Index(
+            "ix_books_user_uid_created_at_uid",
+            "user_uid",
+            "created_at",
+            "uid",
+            postgresql_where=sa.text("user_uid IS NOT NULL"),
+        ),
+        Index("ix_books_price", "price"),
+        Index("ix_books_published_date", "published_date"),
+        Index("ix_books_search_vector", "search_vector", postgresql_using="gin"),
+    )
+    # search_vector is generated by Postgres and only used in WHERE/ORDER BY,
+    # so it is kept on the table but never loaded into Book instances.
+    __mapper_args__ = {"exclude_properties": ["search_vector"]}
 
     uid: uuid.UUID = Field(
         sa_column=Column(pg.UUID, nullable=False, primary_key=True, default=uuid.uuid4)
@@ -72,22 +106,103 @@ class Book(SQLModel, table=True):
     user_uid: Optional[uuid.UUID] = Field(default=None, foreign_key="users.uid")
     created_at: datetime = Field(sa_column=Column(pg.TIMESTAMP, default=datetime.now))
     updated_at: datetime = Field(sa_column=Column(pg.TIMESTAMP, default=datetime.now))
+    review_count: int = Field(
+        default=0,
+        sa_column=Column(pg.INTEGER, nullable=False, default=0, server_default="0"),
+    )
+    rating_sum: int = Field(
+        default=0,
+        sa_column=Column(pg.INTEGER, nullable=False, default=0, server_default="0"),
+    )
+    rating_1_count: int = Field(
+        default=0,
+        sa_column=Column(pg.INTEGER, nullable=False, default=0, server_default="0"),
+    )
+    rating_2_count: int = Field(
+        default=0,
+        sa_column=Column(pg.INTEGER, nullable=False, default=0, server_default="0"),
+    )
+    rating_3_count: int = Field(
+        default=0,
+        sa_column=Column(pg.INTEGER, nullable=False, default=0, server_default="0"),
+    )
+    rating_4_count: int = Field(
+        default=0,
+        sa_column=Column(pg.INTEGER, nullable=False, default=0, server_default="0"),
+    )
+    rating_5_count: int = Field(
+        default=0,
+        sa_column=Column(pg.INTEGER, nullable=False, default=0, server_default="0"),
+    )
+    search_vector: Optional[str] = Field(
+        default=None,
+        exclude=True,
+        sa_column=Column(
+            pg.TSVECTOR,
+            sa.Computed(
+                "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+                "setweight(to_tsvector('english', coalesce(author, '')), 'B') || "
+                "setweight(to_tsvector('english', coalesce(genre, '')), 'C') || "
+                "setweight(to_tsvector('english', coalesce(publisher, '')), 'D')",
+                persisted=True,
+            ),
+        ),
+    )
     user: Optional[User] = Relationship(back_populates="books")
     reviews: List["Review"] = Relationship(
-        back_populates="book", sa_relationship_kwargs={"lazy": "selectin"}
+        back_populates="book", sa_relationship_kwargs={"lazy": "raise"}
     )
     tags: List[Tag] = Relationship(
         link_model=BookTag,
         back_populates="books",
-        sa_relationship_kwargs={"lazy": "selectin"},
+        sa_relationship_kwargs={"lazy": "raise"},
     )
 
+    @property
+    def average_rating(self) -> Optional[float]:
+        if not self.review_count:
+            return None
+        return round(self.rating_sum / self.review_count, 2)
+
+    @property
+    def rating_histogram(self) -> Dict[int, int]:
+        return {
+            rating: getattr(self, f"rating_{rating}_count") for rating in range(1, 6)
+        }
+
     def __repr__(self):
         return f"<Book {self.title}>"
 
 
 class Review(SQLModel, table=True):
     __tablename__ = "reviews"
+    __table_args__ = (
+        Index("ix_reviews_created_at_uid", "created_at", "uid"),
+        Index("ix_reviews_updated_at_uid", "updated_at", "uid"),
+        Index("ix_reviews_book_uid_created_at_uid", "book_uid", "created_at", "uid"),
+        Index(
+            "ix_reviews_book_uid_rating_created_at_uid",
+            "book_uid",
+            "rating",
+            "created_at",
+            "uid",
+        ),
+        Index(
+            "ix_reviews_external_source_external_id",
+            "external_source",
+            "external_id",
+            unique=True,
+        ),
+        Index("ix_reviews_search_vector", "search_vector", postgresql_using="gin"),
+        Index(
+            "ix_reviews_review_text_trgm",
+            "review_text",
+            postgresql_using="gin",
+            postgresql_ops={"review_text": "gin_trgm_ops"},
+        ),
+    )
+    # Generated and only used for searching, like books.search_vector.
+    __mapper_args__ = {"exclude_properties": ["search_vector"]}
 
     uid: uuid.UUID = Field(
         sa_column=Column(pg.UUID, nullable=False, primary_key=True, default=uuid.uuid4)
@@ -96,8 +211,27 @@ class Review(SQLModel, table=True):
     review_text: str = Field(sa_column=Column(pg.VARCHAR, nullable=False))
     user_uid: Optional[uuid.UUID] = Field(default=None, foreign_key="users.uid")
     book_uid: Optional[uuid.UUID] = Field(default=None, foreign_key="books.uid")
+    # Set for reviews imported from partner platforms; external ids are only
+    # unique within the partner (external_source) that issued them.
+    external_source: Optional[str] = Field(
+        default=None, sa_column=Column(pg.VARCHAR, nullable=True)
+    )
+    external_id: Optional[str] = Field(
+        default=None, sa_column=Column(pg.VARCHAR, nullable=True)
+    )
+    external_user_id: Optional[str] = Field(
+        default=None, sa_column=Column(pg.VARCHAR, nullable=True)
+    )
     created_at: datetime = Field(sa_column=Column(pg.TIMESTAMP, default=datetime.now))
     updated_at: datetime = Field(sa_column=Column(pg.TIMESTAMP, default=datetime.now))
+    search_vector: Optional[str] = Field(
+        default=None,
+        exclude=True,
+        sa_column=Column(
+            pg.TSVECTOR,
+            sa.Computed("to_tsvector('english', review_text)", persisted=True),
+        ),
+    )
     user: Optional[User] = Relationship(back_populates="reviews")
     book: Optional[Book] = Relationship(back_populates="reviews")
 
@@ -0,0 +1,26 @@
+import base64
+import json
+from typing import Any, Callable, List
+from src.errors import InvalidCursorError
+
+
+def encode_cursor(*values: Any) -> str:
+    """Encode the sort key of the last row of a page into an opaque cursor."""
+    payload = json.dumps([str(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, *parsers: Callable[[str], Any]) -> List[Any]:
+    """
+    Decode a cursor produced by `encode_cursor`.
+    - Each raw value is converted with the parser at the same position.
+    - Raises InvalidCursorError for anything that was not issued by the API.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(parsers):
+            raise ValueError("cursor has an unexpected shape")
+        return [parse(value) for parse, value in zip(parsers, values)]
+    except (ValueError, TypeError):
+        raise InvalidCursorError()
@@ -1,17 +1,121 @@
 import redis.asyncio as redis
 from src.config import Config
+from typing import Dict, List, Optional, Tuple
+import uuid
 
 JTI_EXPIRY = 3600
+BOOK_CACHE_EXPIRY = 300
+# Entries are "<etag>\n<payload>" so a hit also answers conditional requests.
+BOOK_CACHE_PREFIX = "book:detail:v2:"
+BOOK_CACHE_STATS = "book:detail:stats"
+INVALIDATION_BATCH_SIZE = 1000
+USER_SNAPSHOT_EXPIRY = 60
+USER_SNAPSHOT_PREFIX = "user:snapshot:"
 
-token_blocklist = redis.from_url(
+redis_client = redis.from_url(
     url=Config.REDIS_URL,
 )
 
 
 async def add_token_to_blocklist(jti: str) -> None:
-    await token_blocklist.set(name=jti, value="", ex=JTI_EXPIRY)
+    await redis_client.set(name=jti, value="", ex=JTI_EXPIRY)
 
 
 async def is_token_in_blocklist(jti: str) -> bool:
-    result = await token_blocklist.get(jti)
+    result = await redis_client.get(jti)
     return result is not None
+
+
+def book_cache_key(book_uid) -> str:
+    return f"{BOOK_CACHE_PREFIX}{uuid.UUID(str(book_uid))}"
+
+
+def split_cached_book(entry: bytes) -> Tuple[str, str]:
+    etag, payload = entry.decode().split("\n", 1)
+    return etag, payload
+
+
+async def get_cached_book(book_uid) -> Optional[Tuple[str, str]]:
+    # One round trip: the lookup counter rides along with the GET, and
+    # misses are counted separately on the slower database path.
+    async with redis_client.pipeline(transaction=False) as pipe:
+        pipe.get(book_cache_key(book_uid))
+        pipe.hincrby(BOOK_CACHE_STATS, "lookups", 1)
+        entry, _ = await pipe.execute()
+
+    if entry is None:
+        await redis_client.hincrby(BOOK_CACHE_STATS, "misses", 1)
+        return None
+    return split_cached_book(entry)
+
+
+async def cache_book(book_uid, etag: str, payload: str) -> None:
+    await redis_client.set(
+        name=book_cache_key(book_uid),
+        value=f"{etag}\n{payload}",
+        ex=BOOK_CACHE_EXPIRY,
+    )
+
+
+async def get_cached_books(book_uids: List) -> List[Optional[str]]:
+    if not book_uids:
+        return []
+
+    async with redis_client.pipeline(transaction=False) as pipe:
+        pipe.mget([book_cache_key(book_uid) for book_uid in book_uids])
+        pipe.hincrby(BOOK_CACHE_STATS, "lookups", len(book_uids))
+        entries, _ = await pipe.execute()
+
+    misses = sum(1 for entry in entries if entry is None)
+    if misses:
+        await redis_client.hincrby(BOOK_CACHE_STATS, "misses", misses)
+    return [
+        split_cached_book(entry)[1] if entry is not None else None
+        for entry in entries
+    ]
+
+
+async def cache_books(entries: Dict[object, Tuple[str, str]]) -> None:
+    if not entries:
+        return
+
+    async with redis_client.pipeline(transaction=False) as pipe:
+        for book_uid, (etag, payload) in entries.items():
+            pipe.set(
+                name=book_cache_key(book_uid),
+                value=f"{etag}\n{payload}",
+                ex=BOOK_CACHE_EXPIRY,
+            )
+        await pipe.execute()
+
+
+async def invalidate_cached_books(*book_uids) -> None:
+    keys = [book_cache_key(book_uid) for book_uid in book_uids]
+    for start in range(0, len(keys), INVALIDATION_BATCH_SIZE):
+        await redis_client.delete(*keys[start : start + INVALIDATION_BATCH_SIZE])
+
+
+async def get_book_cache_stats() -> dict:
+    stats = await redis_client.hgetall(BOOK_CACHE_STATS)
+    lookups = int(stats.get(b"lookups", 0))
+    misses = int(stats.get(b"misses", 0))
+    return {"hits": lookups - misses, "misses": misses}
+
+
+def user_snapshot_key(user_uid) -> str:
+    return f"{USER_SNAPSHOT_PREFIX}{uuid.UUID(str(user_uid))}"
+
+
+async def get_cached_user_snapshot(user_uid) -> Optional[str]:
+    payload = await redis_client.get(user_snapshot_key(user_uid))
+    return payload.decode() if payload is not None else None
+
+
+async def cache_user_snapshot(user_uid, payload: str) -> None:
+    await redis_client.set(
+        name=user_snapshot_key(user_uid), value=payload, ex=USER_SNAPSHOT_EXPIRY
+    )
+
+
+async def invalidate_user_snapshot(user_uid) -> None:
+    await redis_client.delete(user_snapshot_key(user_uid))
@@ -72,6 +72,14 @@ class TagAlreadyExistsError(BooklyError):
     """Raised when trying to create a tag that already exists."""
 
 
+class InvalidTagFilterError(BooklyError):
+    """Raised when a books-by-tag query names no tags to filter on."""
+
+
+class InvalidCursorError(BooklyError):
+    """Raised when a pagination cursor is malformed or was not issued by the API."""
+
+
 def create_exception_handler(
     status_code: int, initial_detail: Any
 ) -> Callable[[Request, Exception], JSONResponse]:
@@ -282,6 +290,31 @@ def register_error_handlers(app: FastAPI):
         ),
     )
 
+    app.add_exception_handler(
+        InvalidTagFilterError,
+        create_exception_handler(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            initial_detail={
+                "message": "At least one tag is required to filter books",
+                "error_code": "invalid_tag_filter",
+                "resolution": "Please pass tag names in the all and/or any parameters",
+            },
+        ),
+    )
+
+    # Pagination-related exceptions
+    app.add_exception_handler(
+        InvalidCursorError,
+        create_exception_handler(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            initial_detail={
+                "message": "The provided pagination cursor is invalid",
+                "error_code": "invalid_cursor",
+                "resolution": "Please use the next_cursor value returned by the previous page",
+            },
+        ),
+    )
+
     # Generic server error handler
     @app.exception_handler(500)
     async def internal_server_error_handler(request, exc):
@@ -0,0 +1,19 @@
+import hashlib
+from typing import Optional
+
+
+def make_etag(*parts) -> str:
+    """Build a strong ETag from the values that version a resource."""
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Compare an If-None-Match header against an ETag (weak comparison, RFC 9110)."""
+    if not if_none_match:
+        return False
+
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    if "*" in candidates:
+        return True
+    return any(candidate.removeprefix("W/") == etag for candidate in candidates)
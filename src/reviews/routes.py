@@ -1,33 +1,133 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, status, Header, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from typing import Optional
+from datetime import datetime
+import uuid
 from src.reviews.service import ReviewService
-from src.reviews.schemas import ReviewCreateModel
+from src.reviews.schemas import (
+    ReviewCreateModel,
+    ReviewPageModel,
+    ReviewImportResultModel,
+    ReviewSearchPageModel,
+)
 from sqlmodel.ext.asyncio.session import AsyncSession
 from src.db.main import get_session
-from src.auth.dependencies import RoleChecker, get_current_user
-from src.db.models import User
+from src.auth.dependencies import AccessTokenBearer, RoleChecker, get_current_user
+from src.auth.schemas import UserSnapshotModel
 from src.errors import ReviewNotFoundError
+from src.etag import etag_matches
+from src.streaming import MEDIA_TYPES
 
 review_service = ReviewService()
 review_router = APIRouter()
+access_token_bearer = AccessTokenBearer()
 admin_role_checker = Depends(RoleChecker(["admin"]))
 user_role_checker = Depends(RoleChecker(["admin", "user"]))
 
 
-@review_router.get("/", dependencies=[admin_role_checker])
-async def get_all_reviews(session: AsyncSession = Depends(get_session)):
-    reviews = await review_service.get_all_reviews(session=session)
-    return reviews
+@review_router.get(
+    "/", response_model=ReviewPageModel, dependencies=[admin_role_checker]
+)
+async def get_all_reviews(
+    limit: int = Query(default=20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    since: Optional[datetime] = None,
+    fmt: str = Query(default="json", alias="format", pattern="^(json|ndjson)$"),
+    session: AsyncSession = Depends(get_session),
+):
+    if fmt == "ndjson":
+        return StreamingResponse(
+            review_service.export_reviews(since=since),
+            media_type=MEDIA_TYPES["ndjson"],
+            headers={"Content-Disposition": 'attachment; filename="reviews.ndjson"'},
+        )
+
+    return await review_service.get_all_reviews(
+        session=session, limit=limit, cursor=cursor, since=since
+    )
+
+
+@review_router.post(
+    "/import",
+    response_model=ReviewImportResultModel,
+    dependencies=[admin_role_checker],
+)
+async def import_reviews(
+    request: Request,
+    source: str = Query(min_length=1, max_length=50, pattern="^[a-z0-9_-]+$"),
+    fmt: str = Query(default="ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    session: AsyncSession = Depends(get_session),
+) -> dict:
+    summary = await review_service.import_reviews(
+        request.stream(), fmt, source, session
+    )
+    return summary
+
+
+@review_router.get(
+    "/book/{book_uid}",
+    response_model=ReviewPageModel,
+    dependencies=[user_role_checker],
+)
+async def get_book_reviews(
+    book_uid: str,
+    limit: int = Query(default=20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    sort: str = Query(default="newest", pattern="^(newest|rating)$"),
+    session: AsyncSession = Depends(get_session),
+):
+    return await review_service.get_book_reviews(
+        book_uid=book_uid, session=session, limit=limit, cursor=cursor, sort=sort
+    )
+
+
+@review_router.get(
+    "/search", response_model=ReviewSearchPageModel, dependencies=[user_role_checker]
+)
+async def search_reviews(
+    q: str = Query(min_length=1, max_length=200),
+    mode: str = Query(default="fulltext", pattern="^(fulltext|substring)$"),
+    book_uid: Optional[uuid.UUID] = None,
+    min_rating: Optional[int] = Query(default=None, ge=1, le=5),
+    max_rating: Optional[int] = Query(default=None, ge=1, le=5),
+    limit: int = Query(default=20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    session: AsyncSession = Depends(get_session),
+):
+    return await review_service.search_reviews(
+        query=q,
+        session=session,
+        mode=mode,
+        book_uid=book_uid,
+        min_rating=min_rating,
+        max_rating=max_rating,
+        limit=limit,
+        cursor=cursor,
+    )
 
 
 @review_router.get("/{review_uid}", dependencies=[user_role_checker])
 async def get_review_by_uid(
-    review_uid: str, session: AsyncSession = Depends(get_session)
+    review_uid: str,
+    response: Response,
+    if_none_match: Optional[str] = Header(default=None),
+    session: AsyncSession = Depends(get_session),
 ):
+    etag = await review_service.get_review_etag(review_uid=review_uid, session=session)
+    if etag is None:
+        raise ReviewNotFoundError()
+
+    if etag_matches(if_none_match, etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+        )
+
     review = await review_service.get_review_by_uid(
         review_uid=review_uid, session=session
     )
     if not review:
         raise ReviewNotFoundError()
+    response.headers["ETag"] = etag
     return review
 
 
@@ -35,11 +135,11 @@ async def get_review_by_uid(
 async def add_review(
     book_uid: str,
     review_data: ReviewCreateModel,
-    current_user: User = Depends(get_current_user),
+    token_details: dict = Depends(access_token_bearer),
     session: AsyncSession = Depends(get_session),
 ):
     new_review = await review_service.add_review(
-        user_email=current_user.email,
+        user_uid=token_details["user"]["user_uid"],
         book_uid=book_uid,
         review_data=review_data,
         session=session,
@@ -53,12 +153,12 @@ async def add_review(
 async def update_review(
     review_uid: str,
     review_data: ReviewCreateModel,
-    current_user: User = Depends(get_current_user),
+    current_user: UserSnapshotModel = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
 ):
     updated_review = await review_service.update_review(
         review_uid=review_uid,
-        user_email=current_user.email,
+        user_uid=current_user.uid,
         review_data=review_data,
         session=session,
     )
@@ -71,12 +171,12 @@ async def update_review(
 )
 async def delete_review(
     review_uid: str,
-    current_user: User = Depends(get_current_user),
+    current_user: UserSnapshotModel = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
 ):
     await review_service.delete_review(
         review_uid=review_uid,
-        user_email=current_user.email,
+        user_uid=current_user.uid,
         session=session,
     )
     return None
@@ -1,7 +1,7 @@
 from pydantic import BaseModel, Field
 import uuid
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 class ReviewModel(BaseModel):
     uid: uuid.UUID
@@ -12,6 +12,34 @@ class ReviewModel(BaseModel):
     created_at: datetime
     updated_at: datetime
 
+class ReviewPageModel(BaseModel):
+    items: List[ReviewModel]
+    next_cursor: Optional[str]
+
+class ReviewSearchResultModel(ReviewModel):
+    rank: Optional[float]
+    snippet: str
+
+class ReviewSearchPageModel(BaseModel):
+    items: List[ReviewSearchResultModel]
+    next_cursor: Optional[str]
+
 class ReviewCreateModel(BaseModel):
     rating: int = Field(ge=1, le=5)
-    review_text: str
\ No newline at end of file
+    review_text: str
+
+class ReviewImportModel(ReviewCreateModel):
+    book_uid: uuid.UUID
+    external_id: str = Field(min_length=1)
+    external_user_id: Optional[str] = None
+
+class ReviewImportErrorModel(BaseModel):
+    row: int
+    errors: List[str]
+
+class ReviewImportResultModel(BaseModel):
+    imported: int
+    duplicates: int
+    failed: int
+    errors: List[ReviewImportErrorModel]
+    errors_truncated: bool
@@ -1,9 +1,31 @@
 from sqlmodel.ext.asyncio.session import AsyncSession
-from src.reviews.schemas import ReviewCreateModel
-from src.books.service import BookService
-from src.auth.service import UserService
-from src.db.models import Review
-from sqlmodel import select, desc
+from src.reviews.schemas import (
+    ReviewCreateModel,
+    ReviewModel,
+    ReviewImportModel,
+    ReviewSearchResultModel,
+)
+from src.db.models import Review, Book
+from src.db.pagination import encode_cursor, decode_cursor
+from src.db.filters import uid_in
+from src.db.main import async_session_maker
+from src.streaming import iter_encoded, iter_validated_batches
+from src.db.redis import invalidate_cached_books
+from src.books.leaderboard import (
+    record_rating_change,
+    record_rating_changes,
+    record_new_review,
+)
+from src.etag import make_etag
+from sqlmodel import select, desc, func, insert, update, delete
+from sqlalchemy import tuple_, literal, true
+from sqlalchemy.exc import IntegrityError
+import sqlalchemy.dialects.postgresql as pg
+from typing import AsyncIterator, Dict, List, Optional
+from datetime import datetime
+import html
+import re
+import uuid
 from src.errors import (
     BookNotFoundError,
     ReviewNotFoundError,
@@ -11,81 +33,663 @@ from src.errors import (
     UserNotFoundError,
 )
 
-book_service = BookService()
-user_service = UserService()
+
+RATING_COUNT_COLUMNS = {
+    1: Book.rating_1_count,
+    2: Book.rating_2_count,
+    3: Book.rating_3_count,
+    4: Book.rating_4_count,
+    5: Book.rating_5_count,
+}
+EXPORT_BATCH_SIZE = 1000
+IMPORT_BATCH_SIZE = 1000
+IMPORT_ERROR_LIMIT = 1000
+
+# Sort keys for a book's reviews; each is served backwards by an index
+# starting with book_uid and ending in uid, which also breaks ties.
+REVIEW_SORTS = {
+    "newest": (Review.created_at, Review.uid),
+    "rating": (Review.rating, Review.created_at, Review.uid),
+}
+# What a book's review listing returns (ReviewModel). review_text is unbounded,
+# so those indexes cannot cover it and each returned row still costs one heap
+# fetch; selecting only these keeps the external ids out of the page.
+REVIEW_LIST_COLUMNS = (
+    Review.uid,
+    Review.rating,
+    Review.review_text,
+    Review.user_uid,
+    Review.book_uid,
+    Review.created_at,
+    Review.updated_at,
+)
+# Matches are delimited in SQL with private-use characters, which are
+# stripped from the review text first, and turned into <mark> tags only
+# after the snippet has been HTML-escaped.
+SNIPPET_START = "\ue000"
+SNIPPET_STOP = "\ue001"
+SNIPPET_OPTIONS = (
+    f"StartSel={SNIPPET_START}, StopSel={SNIPPET_STOP}, MaxFragments=2, MaxWords=20"
+)
+# Characters of context kept on each side of a substring match.
+SNIPPET_CONTEXT = 60
+REVIEW_CURSOR_PARSERS = {
+    "newest": (datetime.fromisoformat, uuid.UUID),
+    "rating": (int, datetime.fromisoformat, uuid.UUID),
+}
+
+
+def review_page(reviews: List[Review], limit: int, sort: str = "newest") -> dict:
+    # `reviews` holds up to limit + 1 rows; the extra one only signals a next page.
+    next_cursor = None
+    if len(reviews) > limit:
+        reviews = reviews[:limit]
+        last = reviews[-1]
+        next_cursor = encode_cursor(
+            *(getattr(last, column.key) for column in REVIEW_SORTS[sort])
+        )
+    return {"items": reviews, "next_cursor": next_cursor}
+
+
+def render_snippet(snippet: str) -> str:
+    return (
+        html.escape(snippet)
+        .replace(SNIPPET_START, "<mark>")
+        .replace(SNIPPET_STOP, "</mark>")
+    )
+
+
+def as_naive_local(moment: datetime) -> datetime:
+    # Review timestamps are stored as naive local time.
+    if moment.tzinfo is None:
+        return moment
+    return moment.astimezone().replace(tzinfo=None)
 
 
 class ReviewService:
-    async def get_all_reviews(self, session: AsyncSession):
-        statement = select(Review).order_by(desc(Review.created_at))
+    async def get_all_reviews(
+        self,
+        session: AsyncSession,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        since: Optional[datetime] = None,
+    ):
+        statement = (
+            select(Review)
+            .order_by(desc(Review.created_at), desc(Review.uid))
+            .limit(limit + 1)
+        )
+        if since is not None:
+            statement = statement.where(Review.updated_at >= as_naive_local(since))
+        if cursor is not None:
+            created_at, review_uid = decode_cursor(
+                cursor, datetime.fromisoformat, uuid.UUID
+            )
+            statement = statement.where(
+                tuple_(Review.created_at, Review.uid) < tuple_(created_at, review_uid)
+            )
+
         result = await session.exec(statement)
-        return result.all()
+        reviews = result.all()
+
+        next_cursor = None
+        if len(reviews) > limit:
+            reviews = reviews[:limit]
+            next_cursor = encode_cursor(reviews[-1].created_at, reviews[-1].uid)
+
+        return {"items": reviews, "next_cursor": next_cursor}
+
+    async def export_reviews(
+        self, since: Optional[datetime] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream reviews as NDJSON in (updated_at, uid) order from a server-side cursor.
+        - `since` is inclusive, so a consumer can resume from the last updated_at
+          it saw and drop the repeated uids.
+        """
+        async with async_session_maker() as session:
+            statement = (
+                select(Review)
+                .order_by(Review.updated_at, Review.uid)
+                .execution_options(yield_per=EXPORT_BATCH_SIZE)
+            )
+            if since is not None:
+                statement = statement.where(Review.updated_at >= as_naive_local(since))
+
+            reviews = await session.stream_scalars(statement)
+            async for chunk in iter_encoded(
+                reviews.partitions(EXPORT_BATCH_SIZE), ReviewModel, "ndjson"
+            ):
+                yield chunk
 
     async def get_review_by_uid(self, review_uid: str, session: AsyncSession):
         statement = select(Review).where(Review.uid == review_uid)
         result = await session.exec(statement)
         return result.first()
 
+    async def get_book_reviews(
+        self,
+        book_uid: str,
+        session: AsyncSession,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        sort: str = "newest",
+    ):
+        try:
+            book_uid = uuid.UUID(book_uid)
+        except ValueError:
+            raise BookNotFoundError()
+
+        sort_columns = REVIEW_SORTS[sort]
+        statement = (
+            select(*REVIEW_LIST_COLUMNS)
+            .where(Review.book_uid == book_uid)
+            .order_by(*(desc(column) for column in sort_columns))
+            .limit(limit + 1)
+        )
+        if cursor is not None:
+            position = decode_cursor(cursor, *REVIEW_CURSOR_PARSERS[sort])
+            statement = statement.where(tuple_(*sort_columns) < tuple_(*position))
+
+        result = await session.exec(statement)
+        reviews = result.all()
+
+        # An empty first page is the only case where a missing book and a
+        # book without reviews look the same.
+        if not reviews and cursor is None and not await self._book_exists(
+            book_uid, session
+        ):
+            raise BookNotFoundError()
+
+        return review_page(reviews, limit, sort)
+
+    async def search_reviews(
+        self,
+        query: str,
+        session: AsyncSession,
+        mode: str = "fulltext",
+        book_uid: Optional[uuid.UUID] = None,
+        min_rating: Optional[int] = None,
+        max_rating: Optional[int] = None,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+    ):
+        """
+        Search review text, ranked for full-text queries and newest first for substrings.
+        - fulltext matches `search_vector` (GIN) with websearch syntax.
+        - substring is a case-insensitive ILIKE served by the trigram index.
+        - Snippets are HTML-escaped review text with matches wrapped in <mark>.
+        """
+        review_text = func.translate(
+            Review.review_text, SNIPPET_START + SNIPPET_STOP, ""
+        )
+        if mode == "fulltext":
+            ts_query = func.websearch_to_tsquery("english", query)
+            rank = func.ts_rank(Review.__table__.c.search_vector, ts_query)
+            snippet = func.ts_headline("english", review_text, ts_query, SNIPPET_OPTIONS)
+            statement = select(Review, rank, snippet).where(
+                Review.__table__.c.search_vector.op("@@")(ts_query)
+            )
+            sort_columns = (rank, Review.uid)
+            cursor_parsers = (float, uuid.UUID)
+        else:
+            start = func.strpos(func.lower(review_text), query.lower())
+            window = func.substr(
+                review_text,
+                func.greatest(start - SNIPPET_CONTEXT, 1),
+                len(query) + 2 * SNIPPET_CONTEXT,
+            )
+            snippet = func.regexp_replace(
+                window,
+                f"({re.escape(query)})",
+                f"{SNIPPET_START}\\1{SNIPPET_STOP}",
+                "gi",
+            )
+            statement = select(Review, literal(None), snippet).where(
+                Review.review_text.icontains(query, autoescape=True)
+            )
+            sort_columns = (Review.created_at, Review.uid)
+            cursor_parsers = (datetime.fromisoformat, uuid.UUID)
+
+        if book_uid is not None:
+            statement = statement.where(Review.book_uid == book_uid)
+        if min_rating is not None:
+            statement = statement.where(Review.rating >= min_rating)
+        if max_rating is not None:
+            statement = statement.where(Review.rating <= max_rating)
+        if cursor is not None:
+            position = decode_cursor(cursor, *cursor_parsers)
+            statement = statement.where(tuple_(*sort_columns) < tuple_(*position))
+
+        statement = statement.order_by(
+            *(desc(column) for column in sort_columns)
+        ).limit(limit + 1)
+        result = await session.exec(statement)
+        rows = result.all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last_review, last_rank, _ = rows[-1]
+            if mode == "fulltext":
+                next_cursor = encode_cursor(last_rank, last_review.uid)
+            else:
+                next_cursor = encode_cursor(last_review.created_at, last_review.uid)
+
+        items = [
+            ReviewSearchResultModel(
+                **review.model_dump(),
+                rank=review_rank,
+                snippet=render_snippet(review_snippet),
+            )
+            for review, review_rank, review_snippet in rows
+        ]
+        return {"items": items, "next_cursor": next_cursor}
+
+    async def get_first_review_pages(
+        self, book_uids: List[uuid.UUID], session: AsyncSession, limit: int
+    ) -> Dict[uuid.UUID, dict]:
+        """
+        Load the newest page of reviews for each of `book_uids` in one query.
+        - A LATERAL subquery takes limit + 1 rows per book straight off the
+          (book_uid, created_at, uid) index, however many reviews a book has.
+        """
+        books = (
+            select(
+                func.unnest(literal(book_uids, pg.ARRAY(pg.UUID(as_uuid=True)))).label(
+                    "uid"
+                )
+            )
+        ).subquery("requested_books")
+        page = (
+            select(*REVIEW_LIST_COLUMNS)
+            .where(Review.book_uid == books.c.uid)
+            .order_by(*(desc(column) for column in REVIEW_SORTS["newest"]))
+            .limit(limit + 1)
+            .lateral("page")
+        )
+        # The LATERAL ordering does not carry through the join on its own.
+        statement = (
+            select(*page.c)
+            .select_from(books)
+            .join(page, true())
+            .order_by(page.c.book_uid, desc(page.c.created_at), desc(page.c.uid))
+        )
+        result = await session.exec(statement)
+
+        reviews = {book_uid: [] for book_uid in book_uids}
+        for review in result.all():
+            reviews[review.book_uid].append(review)
+        return {
+            book_uid: review_page(book_reviews, limit)
+            for book_uid, book_reviews in reviews.items()
+        }
+
+    async def _book_exists(self, book_uid, session: AsyncSession) -> bool:
+        result = await session.exec(select(Book.uid).where(Book.uid == book_uid))
+        return result.first() is not None
+
+    async def get_review_etag(
+        self, review_uid: str, session: AsyncSession
+    ) -> Optional[str]:
+        try:
+            uuid.UUID(review_uid)
+        except ValueError:
+            return None
+
+        statement = select(Review.uid, Review.updated_at).where(
+            Review.uid == review_uid
+        )
+        result = await session.exec(statement)
+        version = result.first()
+        return make_etag(*version) if version is not None else None
+
     async def add_review(
         self,
-        user_email: str,
+        user_uid: str,
         book_uid: str,
         review_data: ReviewCreateModel,
         session: AsyncSession,
     ):
-        book = await book_service.get_book_by_uid(book_uid=book_uid, session=session)
-        if not book:
+        """
+        Insert a review straight from the token's user uid and the path's book uid.
+        - No rows are read up front; the foreign keys do the existence checks
+          and their violations are mapped back to 404s.
+        """
+        try:
+            book_uid = uuid.UUID(book_uid)
+        except ValueError:
             raise BookNotFoundError()
 
-        user = await user_service.get_user_by_email(email=user_email, session=session)
-        if not user:
-            raise UserNotFoundError()
+        now = datetime.now()
+        statement = (
+            insert(Review)
+            .values(
+                **review_data.model_dump(),
+                user_uid=uuid.UUID(user_uid),
+                book_uid=book_uid,
+                created_at=now,
+                updated_at=now,
+            )
+            .returning(Review)
+        )
+        try:
+            result = await session.exec(statement)
+        except IntegrityError as exc:
+            await session.rollback()
+            if "reviews_user_uid_fkey" in str(exc.orig):
+                raise UserNotFoundError()
+            raise BookNotFoundError()
+        new_review = result.scalars().one()
 
-        review_data_dic = review_data.model_dump()
-        new_review = Review(**review_data_dic, book=book, user=user)
-        session.add(new_review)
+        aggregates = await self.update_rating_aggregates(
+            book_uid=book_uid, session=session, added_rating=new_review.rating
+        )
         await session.commit()
+        await self._publish_review_write(
+            book_uid,
+            aggregates,
+            count_delta=1,
+            sum_delta=new_review.rating,
+            is_new_review=True,
+        )
         return new_review
 
     async def update_review(
         self,
         review_uid: str,
-        user_email: str,
+        user_uid: uuid.UUID,
         review_data: ReviewCreateModel,
         session: AsyncSession,
     ):
-        user = await user_service.get_user_by_email(email=user_email, session=session)
-        if not user:
-            raise UserNotFoundError()
-
-        review = await self.get_review_by_uid(review_uid=review_uid, session=session)
-        if not review:
-            raise ReviewNotFoundError()
-
-        if review.user_uid != user.uid:
-            raise ReviewPermissionError()
-
-        update_data = review_data.model_dump()
-        for k, v in update_data.items():
-            setattr(review, k, v)
+        """
+        Update a review owned by `user_uid` in one statement.
+        - The previous rating is read by a locking CTE inside the same UPDATE,
+          so the rating aggregates see the value this write replaced.
+        """
+        previous = (
+            select(Review.uid, Review.rating)
+            .where(Review.uid == review_uid, Review.user_uid == user_uid)
+            .with_for_update()
+            .cte("previous")
+        )
+        statement = (
+            update(Review)
+            .where(Review.uid == previous.c.uid)
+            .values(**review_data.model_dump(), updated_at=datetime.now())
+            .returning(Review, previous.c.rating)
+            .execution_options(synchronize_session=False)
+        )
+        result = await session.exec(statement)
+        row = result.first()
+        if row is None:
+            await self._raise_review_write_error(review_uid, session)
+        review, previous_rating = row
 
+        aggregates = await self.update_rating_aggregates(
+            book_uid=review.book_uid,
+            session=session,
+            added_rating=review.rating,
+            removed_rating=previous_rating,
+        )
         await session.commit()
-        await session.refresh(review)
+        await self._publish_review_write(
+            review.book_uid, aggregates, sum_delta=review.rating - previous_rating
+        )
         return review
 
     async def delete_review(
-        self, review_uid: str, user_email: str, session: AsyncSession
+        self, review_uid: str, user_uid: uuid.UUID, session: AsyncSession
     ):
-        user = await user_service.get_user_by_email(email=user_email, session=session)
-        if not user:
-            raise UserNotFoundError()
+        statement = (
+            delete(Review)
+            .where(Review.uid == review_uid, Review.user_uid == user_uid)
+            .returning(Review.book_uid, Review.rating)
+            .execution_options(synchronize_session=False)
+        )
+        result = await session.exec(statement)
+        row = result.first()
+        if row is None:
+            await self._raise_review_write_error(review_uid, session)
+        book_uid, rating = row
 
-        review = await self.get_review_by_uid(review_uid=review_uid, session=session)
-        if not review:
+        aggregates = await self.update_rating_aggregates(
+            book_uid=book_uid, session=session, removed_rating=rating
+        )
+        await session.commit()
+        await self._publish_review_write(
+            book_uid, aggregates, count_delta=-1, sum_delta=-rating
+        )
+
+    async def _raise_review_write_error(self, review_uid: str, session: AsyncSession):
+        # Only reached when an owner-scoped write matched nothing: tell a
+        # missing review apart from someone else's.
+        await session.rollback()
+        result = await session.exec(select(Review.uid).where(Review.uid == review_uid))
+        if result.first() is None:
             raise ReviewNotFoundError()
+        raise ReviewPermissionError()
+
+    async def import_reviews(
+        self,
+        chunks: AsyncIterator[bytes],
+        fmt: str,
+        source: str,
+        session: AsyncSession,
+    ):
+        """
+        Ingest reviews from partner `source` from an NDJSON or CSV stream.
+        - Each validated batch is one multi-row INSERT ... ON CONFLICT
+          (external_source, external_id) DO NOTHING, so re-sending rows is safe;
+          skipped rows count as duplicates. Partners may reuse each other's ids.
+        - Rating aggregates of the touched books are rebuilt in one set-based
+          pass at the end instead of per row.
+        """
+        summary = {
+            "imported": 0,
+            "duplicates": 0,
+            "failed": 0,
+            "errors": [],
+            "errors_truncated": False,
+        }
+        affected_book_uids = set()
+        imported_sum = 0
+
+        def record_errors(errors: List[dict]):
+            summary["failed"] += len(errors)
+            room = IMPORT_ERROR_LIMIT - len(summary["errors"])
+            summary["errors"].extend(errors[:room])
+            if len(errors) > room:
+                summary["errors_truncated"] = True
+
+        async for valid_rows, errors in iter_validated_batches(
+            chunks, fmt, ReviewImportModel, batch_size=IMPORT_BATCH_SIZE
+        ):
+            book_uids = list({review_data.book_uid for _, review_data in valid_rows})
+            existing = set()
+            if book_uids:
+                result = await session.exec(
+                    select(Book.uid).where(uid_in(Book.uid, book_uids))
+                )
+                existing = set(result.all())
+
+            records = []
+            record_rows = []
+            now = datetime.now()
+            for row_number, review_data in valid_rows:
+                if review_data.book_uid not in existing:
+                    errors.append(
+                        {"row": row_number, "errors": ["book_uid: book not found"]}
+                    )
+                    continue
+                records.append(
+                    {
+                        **review_data.model_dump(),
+                        "external_source": source,
+                        "created_at": now,
+                        "updated_at": now,
+                    }
+                )
+                record_rows.append(row_number)
+
+            if records:
+                statement = (
+                    pg.insert(Review)
+                    .values(records)
+                    .on_conflict_do_nothing(
+                        index_elements=[Review.external_source, Review.external_id]
+                    )
+                    .returning(Review.book_uid, Review.rating)
+                )
+                try:
+                    result = await session.exec(statement)
+                    inserted = result.all()
+                    await session.commit()
+                except Exception as exc:
+                    await session.rollback()
+                    errors.extend(
+                        {"row": row_number, "errors": [f"database error: {exc}"]}
+                        for row_number in record_rows
+                    )
+                else:
+                    summary["imported"] += len(inserted)
+                    summary["duplicates"] += len(records) - len(inserted)
+                    affected_book_uids.update(book_uid for book_uid, _ in inserted)
+                    imported_sum += sum(rating for _, rating in inserted)
+
+            record_errors(sorted(errors, key=lambda error: error["row"]))
+
+        if affected_book_uids:
+            affected = list(affected_book_uids)
+            await self.reconcile_rating_aggregates(session, book_uids=affected)
+            result = await session.exec(
+                select(Book.uid, Book.review_count, Book.rating_sum).where(
+                    uid_in(Book.uid, affected)
+                )
+            )
+            aggregates = result.all()
+            await invalidate_cached_books(*affected)
+            await record_rating_changes(aggregates, summary["imported"], imported_sum)
+
+        return summary
+
+    async def _publish_review_write(
+        self,
+        book_uid,
+        aggregates,
+        count_delta: int = 0,
+        sum_delta: int = 0,
+        is_new_review: bool = False,
+    ):
+        if book_uid is None:
+            return
+
+        await invalidate_cached_books(book_uid)
+        if aggregates is not None and (count_delta or sum_delta):
+            await record_rating_change(book_uid, *aggregates, count_delta, sum_delta)
+        if is_new_review:
+            await record_new_review(book_uid)
+
+    async def update_rating_aggregates(
+        self,
+        book_uid,
+        session: AsyncSession,
+        added_rating: Optional[int] = None,
+        removed_rating: Optional[int] = None,
+    ):
+        """
+        Apply one review write to the rating columns on books.
+        - Runs as a single UPDATE in the caller's transaction; the caller commits.
+        - Increments are computed by Postgres, so concurrent writes do not race.
+        - Always bumps books.updated_at, since the book's representation embeds
+          its reviews and its ETag is derived from that timestamp.
+        - Returns the book's (review_count, rating_sum) after the write.
+        """
+        if book_uid is None:
+            return
+
+        values = {"updated_at": datetime.now()}
+
+        if added_rating != removed_rating:
+            count_delta = 0
+            sum_delta = 0
+
+            if added_rating is not None:
+                count_delta += 1
+                sum_delta += added_rating
+                column = RATING_COUNT_COLUMNS[added_rating]
+                values[column.key] = column + 1
+
+            if removed_rating is not None:
+                count_delta -= 1
+                sum_delta -= removed_rating
+                column = RATING_COUNT_COLUMNS[removed_rating]
+                values[column.key] = column - 1
+
+            values["review_count"] = Book.review_count + count_delta
+            values["rating_sum"] = Book.rating_sum + sum_delta
+
+        statement = (
+            update(Book)
+            .where(Book.uid == book_uid)
+            .values(**values)
+            .returning(Book.review_count, Book.rating_sum)
+            .execution_options(synchronize_session=False)
+        )
+        result = await session.exec(statement)
+        return result.first()
+
+    async def reconcile_rating_aggregates(
+        self, session: AsyncSession, book_uids: Optional[List] = None
+    ) -> int:
+        """
+        Rebuild the rating columns on books from the reviews table.
+        - Only books whose stored values drifted are written.
+        - Restrict the pass to `book_uids` when given, otherwise every book is checked.
+        """
+        totals = (
+            select(
+                Review.book_uid.label("book_uid"),
+                func.count().label("review_count"),
+                func.sum(Review.rating).label("rating_sum"),
+                *(
+                    func.count().filter(Review.rating == rating).label(column.key)
+                    for rating, column in RATING_COUNT_COLUMNS.items()
+                ),
+            )
+            .where(Review.book_uid.is_not(None))
+            .group_by(Review.book_uid)
+        )
+        if book_uids is not None:
+            totals = totals.where(uid_in(Review.book_uid, book_uids))
+        totals = totals.subquery()
+
+        aggregate_columns = [Book.review_count, Book.rating_sum]
+        aggregate_columns.extend(RATING_COUNT_COLUMNS.values())
+
+        rebuild = (
+            update(Book)
+            .where(Book.uid == totals.c.book_uid)
+            .where(
+                tuple_(*aggregate_columns).is_distinct_from(
+                    tuple_(*(totals.c[column.key] for column in aggregate_columns))
+                )
+            )
+            .values({column.key: totals.c[column.key] for column in aggregate_columns})
+            .execution_options(synchronize_session=False)
+        )
 
-        if review.user_uid != user.uid:
-            raise ReviewPermissionError()
+        has_reviews = select(Review.uid).where(Review.book_uid == Book.uid).exists()
+        reset = (
+            update(Book)
+            .where(Book.review_count != 0, ~has_reviews)
+            .values({column.key: 0 for column in aggregate_columns})
+            .execution_options(synchronize_session=False)
+        )
+        if book_uids is not None:
+            reset = reset.where(uid_in(Book.uid, book_uids))
 
-        await session.delete(review)
+        rebuilt = await session.exec(rebuild)
+        reset_result = await session.exec(reset)
         await session.commit()
+        return rebuilt.rowcount + reset_result.rowcount
@@ -0,0 +1,180 @@
+import codecs
+import csv
+import io
+import json
+from typing import AsyncIterator, Iterable, List, Tuple, Type, Union
+from pydantic import BaseModel, ValidationError
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Split a stream of UTF-8 byte chunks into lines without buffering the whole body."""
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    pending = ""
+
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.rstrip("\r")
+
+
+# Longest CSV record accepted, in characters; only a record with an unbalanced
+# quote normally gets near it, and it would otherwise swallow the rest of the file.
+MAX_CSV_RECORD_SIZE = 1024 * 1024
+
+
+async def iter_csv_records(
+    lines: AsyncIterator[str], max_size: int = MAX_CSV_RECORD_SIZE
+) -> AsyncIterator[Union[str, ValueError]]:
+    """
+    Join physical lines into CSV records, keeping quoted newlines inside a field.
+    - A record that grows past `max_size` characters is dropped and yielded as a
+      ValueError; reading resumes with the next line.
+    """
+    parts: List[str] = []
+    size = 0
+    quotes = 0
+    async for line in lines:
+        parts.append(line)
+        size += len(line) + 1
+        quotes += line.count('"')
+        if quotes % 2 == 0:
+            yield "\n".join(parts)
+        elif size > max_size:
+            yield ValueError(
+                f"record is longer than {max_size} characters, "
+                "possibly an unbalanced quote"
+            )
+        else:
+            continue
+        parts, size, quotes = [], 0, 0
+
+    if parts:
+        yield "\n".join(parts)
+
+
+async def iter_rows(
+    chunks: AsyncIterator[bytes], fmt: str
+) -> AsyncIterator[Tuple[int, object]]:
+    """
+    Yield (row_number, raw_row) pairs from an NDJSON or CSV byte stream.
+    - CSV rows are dicts keyed by the header line; NDJSON rows are decoded JSON values.
+    - A row that cannot be decoded is yielded as a ValueError instead of a row.
+    """
+    lines = iter_lines(chunks)
+
+    if fmt == "ndjson":
+        row_number = 0
+        async for line in lines:
+            if not line.strip():
+                continue
+            row_number += 1
+            try:
+                yield row_number, json.loads(line)
+            except ValueError as exc:
+                yield row_number, ValueError(f"invalid JSON: {exc}")
+        return
+
+    header = None
+    row_number = 0
+    async for record in iter_csv_records(lines):
+        if isinstance(record, ValueError):
+            if header is None:
+                # Without a header no later row can be mapped to fields.
+                yield 1, ValueError(f"header: {record}")
+                return
+            row_number += 1
+            yield row_number, record
+            continue
+        if not record.strip():
+            continue
+        values = next(csv.reader([record]))
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        row_number += 1
+        if len(values) != len(header):
+            yield row_number, ValueError(
+                f"expected {len(header)} columns, got {len(values)}"
+            )
+            continue
+        yield row_number, dict(zip(header, values))
+
+
+async def iter_validated_batches(
+    chunks: AsyncIterator[bytes],
+    fmt: str,
+    model: Type[BaseModel],
+    batch_size: int = 1000,
+) -> AsyncIterator[Tuple[List[Tuple[int, BaseModel]], List[dict]]]:
+    """
+    Validate streamed rows against `model` and yield them in fixed-size batches.
+    - Each batch is a (valid_rows, errors) pair; valid rows keep their row number.
+    - Only one batch is held in memory at a time.
+    """
+    valid: List[Tuple[int, BaseModel]] = []
+    errors: List[dict] = []
+
+    async for row_number, row in iter_rows(chunks, fmt):
+        if isinstance(row, ValueError):
+            errors.append({"row": row_number, "errors": [str(row)]})
+        elif not isinstance(row, dict):
+            errors.append({"row": row_number, "errors": ["row must be an object"]})
+        else:
+            try:
+                valid.append((row_number, model.model_validate(row)))
+            except ValidationError as exc:
+                errors.append(
+                    {
+                        "row": row_number,
+                        "errors": [
+                            f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+                            for error in exc.errors()
+                        ],
+                    }
+                )
+
+        if len(valid) + len(errors) >= batch_size:
+            yield valid, errors
+            valid, errors = [], []
+
+    if valid or errors:
+        yield valid, errors
+
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+async def iter_encoded(
+    partitions: AsyncIterator[Iterable[object]], model: Type[BaseModel], fmt: str
+) -> AsyncIterator[str]:
+    """
+    Serialize partitions of ORM rows through `model` as NDJSON or CSV text.
+    - One string is yielded per partition so the response is written in large chunks.
+    - CSV output starts with a header row built from the model's fields.
+    """
+    fields = list(model.model_fields)
+
+    if fmt == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(fields)
+        yield buffer.getvalue()
+
+    async for partition in partitions:
+        items = [model.model_validate(row, from_attributes=True) for row in partition]
+
+        if fmt == "ndjson":
+            yield "".join(f"{item.model_dump_json()}\n" for item in items)
+            continue
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for item in items:
+            data = item.model_dump(mode="json")
+            writer.writerow([data[field] for field in fields])
+        yield buffer.getvalue()
@@ -0,0 +1,151 @@
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+from pydantic import TypeAdapter
+from sqlmodel import select, desc
+from sqlmodel.ext.asyncio.session import AsyncSession
+from src.db.models import Tag
+from src.db.redis import redis_client
+from src.tags.schemas import TagModel, TagUsageModel
+
+TAG_CACHE_CHANNEL = "tags:changed"
+# Upper bound on staleness should an invalidation message ever be missed.
+TAG_CACHE_TTL = 300
+LISTENER_RETRY_DELAY = 5
+# Most suggestions a single prefix can return; each trie node keeps this many.
+SUGGEST_LIMIT = 10
+
+logger = logging.getLogger(__name__)
+tag_list_adapter = TypeAdapter(List[TagModel])
+
+
+class PrefixIndex:
+    """
+    Trie over lower-cased names where every node stores its best entries.
+    - Entries must be inserted best first; a lookup is then O(len(prefix))
+      and never visits the subtree below the prefix.
+    """
+
+    def __init__(self, size: int = SUGGEST_LIMIT) -> None:
+        self._size = size
+        self._root: Tuple[Dict, List] = ({}, [])
+
+    def add(self, name: str, entry) -> None:
+        node = self._root
+        self._keep(node, entry)
+        for char in name.lower():
+            node = node[0].setdefault(char, ({}, []))
+            self._keep(node, entry)
+
+    def search(self, prefix: str) -> List:
+        node = self._root
+        for char in prefix.lower():
+            node = node[0].get(char)
+            if node is None:
+                return []
+        return node[1]
+
+    def _keep(self, node: Tuple[Dict, List], entry) -> None:
+        if len(node[1]) < self._size:
+            node[1].append(entry)
+
+
+class TagCache:
+    """
+    Per-process copy of the tags table.
+    - Holds a name -> TagModel dict, the serialized GET /tags/ response and a
+      prefix trie of tags ranked by how many books carry them.
+    - Reloaded on the next access after `invalidate` or once TAG_CACHE_TTL passes.
+    """
+
+    def __init__(self) -> None:
+        self._by_name: Dict[str, TagModel] = {}
+        self._payload = b"[]"
+        self._prefixes = PrefixIndex()
+        self._loaded_at: Optional[float] = None
+        self._generation = 0
+        self._lock = asyncio.Lock()
+
+    @property
+    def is_fresh(self) -> bool:
+        return (
+            self._loaded_at is not None
+            and time.monotonic() - self._loaded_at < TAG_CACHE_TTL
+        )
+
+    def invalidate(self) -> None:
+        self._generation += 1
+        self._loaded_at = None
+
+    async def load(self, session: AsyncSession) -> None:
+        async with self._lock:
+            if self.is_fresh:
+                return
+
+            # An invalidation that lands while the query runs must not be
+            # hidden by this load marking the cache fresh.
+            generation = self._generation
+            result = await session.exec(select(Tag).order_by(desc(Tag.created_at)))
+
+            tags = []
+            suggestions = []
+            for tag in result.all():
+                tags.append(TagModel.model_validate(tag, from_attributes=True))
+                suggestions.append(
+                    TagUsageModel.model_validate(tag, from_attributes=True)
+                )
+
+            prefixes = PrefixIndex()
+            suggestions.sort(key=lambda tag: (-tag.book_count, tag.name))
+            for suggestion in suggestions:
+                prefixes.add(suggestion.name, suggestion)
+
+            self._by_name = {tag.name: tag for tag in tags}
+            self._payload = tag_list_adapter.dump_json(tags)
+            self._prefixes = prefixes
+            if generation == self._generation:
+                self._loaded_at = time.monotonic()
+
+    async def get_payload(self, session: AsyncSession) -> bytes:
+        if not self.is_fresh:
+            await self.load(session)
+        return self._payload
+
+    async def get_by_name(self, name: str, session: AsyncSession) -> Optional[TagModel]:
+        if not self.is_fresh:
+            await self.load(session)
+        return self._by_name.get(name)
+
+    async def suggest(
+        self, prefix: str, limit: int, session: AsyncSession
+    ) -> List[TagUsageModel]:
+        if not self.is_fresh:
+            await self.load(session)
+        return self._prefixes.search(prefix)[:limit]
+
+
+tag_cache = TagCache()
+
+
+async def publish_tag_change() -> None:
+    tag_cache.invalidate()
+    await redis_client.publish(TAG_CACHE_CHANNEL, "changed")
+
+
+async def listen_for_tag_changes() -> None:
+    """Invalidate this process's tag cache whenever any worker changes the tags."""
+    while True:
+        try:
+            async with redis_client.pubsub() as pubsub:
+                await pubsub.subscribe(TAG_CACHE_CHANNEL)
+                # Changes published while we were not subscribed are lost.
+                tag_cache.invalidate()
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        tag_cache.invalidate()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("tag cache listener failed, reconnecting")
+            await asyncio.sleep(LISTENER_RETRY_DELAY)
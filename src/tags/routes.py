@@ -1,21 +1,86 @@
-from typing import List
-from fastapi import APIRouter, Depends, status
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Query, Response, status
 from src.tags.service import TagService
 from src.auth.dependencies import RoleChecker
-from src.tags.schemas import TagModel, TagCreateModel, TagAddModel
+from src.tags.schemas import (
+    TagModel,
+    TagCreateModel,
+    TagAddModel,
+    TagUsageModel,
+)
+from src.tags.cache import SUGGEST_LIMIT
+from pydantic import TypeAdapter
 from sqlmodel.ext.asyncio.session import AsyncSession
 from src.db.main import get_session
-from src.books.schemas import BookModel
+from src.books.schemas import BookModel, BookPageModel
 
 tag_router = APIRouter()
 tag_service = TagService()
 user_role_checker = Depends(RoleChecker(["user", "admin"]))
+usage_list_adapter = TypeAdapter(List[TagUsageModel])
 
 
 @tag_router.get("/", response_model=List[TagModel], dependencies=[user_role_checker])
 async def get_all_tags(session: AsyncSession = Depends(get_session)):
-    tags = await tag_service.get_all_tags(session=session)
-    return tags
+    payload = await tag_service.get_all_tags_payload(session=session)
+    return Response(content=payload, media_type="application/json")
+
+
+@tag_router.get(
+    "/suggest",
+    response_model=List[TagUsageModel],
+    dependencies=[user_role_checker],
+)
+async def suggest_tags(
+    prefix: str = Query(default="", max_length=100),
+    limit: int = Query(default=SUGGEST_LIMIT, ge=1, le=SUGGEST_LIMIT),
+    session: AsyncSession = Depends(get_session),
+):
+    suggestions = await tag_service.suggest_tags(
+        prefix=prefix, session=session, limit=limit
+    )
+    return Response(
+        content=usage_list_adapter.dump_json(suggestions),
+        media_type="application/json",
+    )
+
+
+@tag_router.get(
+    "/cloud", response_model=List[TagUsageModel], dependencies=[user_role_checker]
+)
+async def get_tag_cloud(
+    limit: int = Query(default=100, ge=1, le=1000),
+    min_count: int = Query(default=1, ge=0),
+    session: AsyncSession = Depends(get_session),
+):
+    tags = await tag_service.get_tag_cloud(
+        session=session, limit=limit, min_count=min_count
+    )
+    return Response(
+        content=usage_list_adapter.dump_json(tags), media_type="application/json"
+    )
+
+
+@tag_router.get(
+    "/books", response_model=BookPageModel, dependencies=[user_role_checker]
+)
+async def get_books_by_tags(
+    all_tags: Optional[str] = Query(default=None, alias="all"),
+    any_tags: Optional[str] = Query(default=None, alias="any"),
+    limit: int = Query(default=20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    session: AsyncSession = Depends(get_session),
+):
+    def split_names(names: Optional[str]) -> List[str]:
+        return [name.strip() for name in (names or "").split(",") if name.strip()]
+
+    return await tag_service.get_books_by_tags(
+        session=session,
+        all_names=split_names(all_tags),
+        any_names=split_names(any_tags),
+        limit=limit,
+        cursor=cursor,
+    )
 
 
 @tag_router.post(
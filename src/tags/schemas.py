@@ -8,6 +8,9 @@ class TagModel(BaseModel):
     name: str
     created_at: datetime
 
+class TagUsageModel(TagModel):
+    book_count: int
+
 class TagCreateModel(BaseModel):
     name: str
 
@@ -1,18 +1,221 @@
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlmodel import select, desc
-from src.db.models import Tag
-from src.tags.schemas import TagCreateModel, TagAddModel
-from src.books.service import BookService
-from src.errors import TagNotFoundError, BookNotFoundError, TagAlreadyExistsError
+from sqlmodel import select, desc, func, update, delete
+from datetime import datetime
+from sqlalchemy import literal, tuple_
+from typing import List, Optional
+from sqlalchemy.exc import IntegrityError
+import sqlalchemy.dialects.postgresql as pg
+import uuid
+from src.db.models import Tag, Book, BookTag
+from src.db.redis import invalidate_cached_books
+from src.tags.schemas import (
+    TagCreateModel,
+    TagAddModel,
+    TagUsageModel,
+)
+from src.tags.cache import tag_cache, publish_tag_change, SUGGEST_LIMIT
+from src.db.pagination import encode_cursor, decode_cursor
+from src.db.filters import uid_in
+from src.errors import (
+    TagNotFoundError,
+    BookNotFoundError,
+    TagAlreadyExistsError,
+    InvalidTagFilterError,
+)
 
-book_service = BookService()
+# Trigram matching needs at least one full trigram to be useful.
+FUZZY_MIN_LENGTH = 3
+
+
+async def touch_tagged_books(tag_uid: str, session: AsyncSession):
+    # Tag names are embedded in book payloads, so renaming or deleting a tag
+    # is a change to every book carrying it.
+    statement = (
+        update(Book)
+        .where(Book.uid.in_(select(BookTag.book_id).where(BookTag.tag_id == tag_uid)))
+        .values(updated_at=datetime.now())
+        .returning(Book.uid)
+        .execution_options(synchronize_session=False)
+    )
+    result = await session.exec(statement)
+    return result.scalars().all()
+
+
+async def unlink_books(book_uids: List, session: AsyncSession) -> bool:
+    """
+    Remove the tag links of `book_uids` and take them off the tags' book counts.
+    - Returns whether any count changed; the caller publishes the tag change
+      once its transaction has committed.
+    """
+    removed = (
+        delete(BookTag)
+        .where(uid_in(BookTag.book_id, book_uids))
+        .returning(BookTag.tag_id)
+        .cte("removed")
+    )
+    removed_counts = (
+        select(removed.c.tag_id, func.count().label("book_count"))
+        .group_by(removed.c.tag_id)
+        .subquery("removed_counts")
+    )
+    result = await session.exec(
+        update(Tag)
+        .where(Tag.uid == removed_counts.c.tag_id)
+        .values(book_count=Tag.book_count - removed_counts.c.book_count)
+        .returning(Tag.uid)
+        .execution_options(synchronize_session=False)
+    )
+    return bool(result.all())
 
 
 class TagService:
-    async def get_all_tags(self, session: AsyncSession):
-        statement = select(Tag).order_by(desc(Tag.created_at))
+    async def get_all_tags_payload(self, session: AsyncSession) -> bytes:
+        return await tag_cache.get_payload(session)
+
+    async def suggest_tags(
+        self, prefix: str, session: AsyncSession, limit: int = SUGGEST_LIMIT
+    ) -> List[TagUsageModel]:
+        """
+        Suggest tags for an autocomplete prefix, most used first.
+        - Served from the in-process prefix trie without touching Postgres.
+        - Only when nothing starts with the prefix does it fall back to a
+          pg_trgm word-similarity query, which tolerates typos.
+        """
+        suggestions = await tag_cache.suggest(prefix, limit, session)
+        if suggestions or len(prefix) < FUZZY_MIN_LENGTH:
+            return suggestions
+
+        statement = (
+            select(Tag)
+            .where(literal(prefix).op("<%")(Tag.name))
+            .order_by(
+                desc(func.word_similarity(prefix, Tag.name)), desc(Tag.book_count)
+            )
+            .limit(limit)
+        )
+        result = await session.exec(statement)
+        return [
+            TagUsageModel.model_validate(tag, from_attributes=True)
+            for tag in result.all()
+        ]
+
+    async def get_tag_cloud(
+        self, session: AsyncSession, limit: int = 100, min_count: int = 1
+    ) -> List[TagUsageModel]:
+        statement = (
+            select(Tag)
+            .where(Tag.book_count >= min_count)
+            .order_by(desc(Tag.book_count), Tag.name)
+            .limit(limit)
+        )
         result = await session.exec(statement)
-        return result.all()
+        return [
+            TagUsageModel.model_validate(tag, from_attributes=True)
+            for tag in result.all()
+        ]
+
+    async def reconcile_tag_counts(self, session: AsyncSession) -> int:
+        """Rebuild tags.book_count from book_tags, writing only the tags that drifted."""
+        counts = (
+            select(BookTag.tag_id, func.count().label("book_count"))
+            .group_by(BookTag.tag_id)
+            .subquery("counts")
+        )
+        actual = func.coalesce(counts.c.book_count, 0)
+        statement = (
+            update(Tag)
+            .where(
+                Tag.uid.in_(
+                    select(Tag.uid)
+                    .outerjoin(counts, counts.c.tag_id == Tag.uid)
+                    .where(Tag.book_count != actual)
+                )
+            )
+            .values(
+                book_count=select(func.count())
+                .where(BookTag.tag_id == Tag.uid)
+                .scalar_subquery()
+            )
+            .execution_options(synchronize_session=False)
+        )
+        result = await session.exec(statement)
+        await session.commit()
+        if result.rowcount:
+            await publish_tag_change()
+        return result.rowcount
+
+    async def get_books_by_tags(
+        self,
+        session: AsyncSession,
+        all_names: List[str],
+        any_names: List[str],
+        limit: int = 20,
+        cursor: Optional[str] = None,
+    ):
+        """
+        Page through books carrying every tag in `all_names` and at least one in `any_names`.
+        - Names are resolved to uids from the tag cache; matching is a single
+          GROUP BY/HAVING over book_tags, served by the (tag_id, book_id) index.
+        - Pages are ordered newest first like GET /books/.
+        """
+        if not all_names and not any_names:
+            raise InvalidTagFilterError()
+
+        all_uids = []
+        for name in dict.fromkeys(all_names):
+            tag = await tag_cache.get_by_name(name, session)
+            if tag is None:
+                return {"items": [], "next_cursor": None}
+            all_uids.append(tag.uid)
+
+        any_uids = []
+        for name in dict.fromkeys(any_names):
+            tag = await tag_cache.get_by_name(name, session)
+            if tag is not None:
+                any_uids.append(tag.uid)
+        if any_names and not any_uids:
+            return {"items": [], "next_cursor": None}
+
+        having = []
+        if all_uids:
+            having.append(
+                func.count().filter(uid_in(BookTag.tag_id, all_uids))
+                == len(all_uids)
+            )
+        if any_uids:
+            having.append(
+                func.count().filter(uid_in(BookTag.tag_id, any_uids)) > 0
+            )
+        matching_books = (
+            select(BookTag.book_id)
+            .where(uid_in(BookTag.tag_id, all_uids + any_uids))
+            .group_by(BookTag.book_id)
+            .having(*having)
+        )
+
+        statement = (
+            select(Book)
+            .where(Book.uid.in_(matching_books))
+            .order_by(desc(Book.created_at), desc(Book.uid))
+            .limit(limit + 1)
+        )
+        if cursor is not None:
+            created_at, book_uid = decode_cursor(
+                cursor, datetime.fromisoformat, uuid.UUID
+            )
+            statement = statement.where(
+                tuple_(Book.created_at, Book.uid) < tuple_(created_at, book_uid)
+            )
+
+        result = await session.exec(statement)
+        books = result.all()
+
+        next_cursor = None
+        if len(books) > limit:
+            books = books[:limit]
+            next_cursor = encode_cursor(books[-1].created_at, books[-1].uid)
+
+        return {"items": books, "next_cursor": next_cursor}
 
     async def get_tag_by_uid(self, tag_uid: str, session: AsyncSession):
         statement = select(Tag).where(Tag.uid == tag_uid)
@@ -20,57 +223,131 @@ class TagService:
         return result.first()
 
     async def add_tag(self, tag_data: TagCreateModel, session: AsyncSession):
-        statement = select(Tag).where(Tag.name == tag_data.name)
-        result = await session.exec(statement)
-        tag = result.first()
-        if tag:
+        if await tag_cache.get_by_name(tag_data.name, session) is not None:
             raise TagAlreadyExistsError()
 
         new_tag = Tag(name=tag_data.name)
         session.add(new_tag)
-        await session.commit()
-        await session.refresh(new_tag)
+        try:
+            await session.commit()
+        except IntegrityError:
+            await session.rollback()
+            raise TagAlreadyExistsError()
+        await publish_tag_change()
         return new_tag
 
     async def update_tag(
         self, tag_uid: str, tag_data: TagCreateModel, session: AsyncSession
     ):
-        tag = await self.get_tag_by_uid(tag_uid=tag_uid, session=session)
+        statement = (
+            update(Tag)
+            .where(Tag.uid == tag_uid)
+            .values(**tag_data.model_dump())
+            .returning(Tag)
+            .execution_options(synchronize_session=False)
+        )
+        try:
+            result = await session.exec(statement)
+        except IntegrityError:
+            await session.rollback()
+            raise TagAlreadyExistsError()
+        tag = result.scalars().first()
         if not tag:
             raise TagNotFoundError()
 
-        updated_data_dic = tag_data.model_dump()
-        for k, v in updated_data_dic.items():
-            setattr(tag, k, v)
-
+        tagged_book_uids = await touch_tagged_books(tag_uid, session)
         await session.commit()
-        await session.refresh(tag)
+        await publish_tag_change()
+        await invalidate_cached_books(*tagged_book_uids)
         return tag
 
     async def delete_tag(self, tag_uid: str, session: AsyncSession):
-        tag = await self.get_tag_by_uid(tag_uid=tag_uid, session=session)
-        if not tag:
+        tagged_book_uids = await touch_tagged_books(tag_uid, session)
+        await session.exec(delete(BookTag).where(BookTag.tag_id == tag_uid))
+        result = await session.exec(
+            delete(Tag)
+            .where(Tag.uid == tag_uid)
+            .returning(Tag.uid)
+            .execution_options(synchronize_session=False)
+        )
+        if result.scalars().first() is None:
+            await session.rollback()
             raise TagNotFoundError()
 
-        await session.delete(tag)
         await session.commit()
+        await publish_tag_change()
+        await invalidate_cached_books(*tagged_book_uids)
 
     async def add_tags_to_book(
         self, book_uid: str, tags_data: TagAddModel, session: AsyncSession
     ):
-        book = await book_service.get_book_by_uid(book_uid=book_uid, session=session)
+        """
+        Attach tags to a book by name, creating the missing ones.
+        - A fixed number of statements regardless of the tag count: the book
+          UPDATE doubles as the existence check, one CTE upserts the tags and
+          links them, and one UPDATE bumps book_count for the new links.
+        - The tag upsert uses a no-op DO UPDATE rather than DO NOTHING so that
+          RETURNING also yields tags that already exist, including ones another
+          request committed while this statement was running.
+        """
+        try:
+            book_uid = uuid.UUID(book_uid)
+        except ValueError:
+            raise BookNotFoundError()
+
+        now = datetime.now()
+        result = await session.exec(
+            update(Book)
+            .where(Book.uid == book_uid)
+            .values(updated_at=now)
+            .returning(Book)
+            .execution_options(synchronize_session=False)
+        )
+        book = result.scalars().first()
         if not book:
             raise BookNotFoundError()
-        
-        for tag_item in tags_data.tags:
-            result = await session.exec(select(Tag).where(Tag.name == tag_item.name))
-            tag = result.one_or_none()
-            if not tag:
-                tag = Tag(name=tag_item.name)
-            
-            book.tags.append(tag)
-        
-        session.add(book)
+
+        # Sorted so that concurrent requests lock the tag rows in the same order.
+        tag_names = sorted({tag_item.name for tag_item in tags_data.tags})
+        linked_tag_uids = []
+        if tag_names:
+            names = select(
+                func.unnest(literal(tag_names, pg.ARRAY(pg.VARCHAR))).label("name")
+            ).cte("names")
+            upsert = pg.insert(Tag).from_select(
+                ["uid", "name", "created_at"],
+                select(func.gen_random_uuid(), names.c.name, literal(now)),
+            )
+            tag_uids = (
+                upsert.on_conflict_do_update(
+                    index_elements=[Tag.name], set_={"name": upsert.excluded.name}
+                )
+                .returning(Tag.uid)
+                .cte("tag_uids")
+            )
+            result = await session.exec(
+                pg.insert(BookTag)
+                .from_select(
+                    ["book_id", "tag_id"],
+                    select(literal(book_uid, pg.UUID(as_uuid=True)), tag_uids.c.uid),
+                )
+                .on_conflict_do_nothing()
+                .returning(BookTag.tag_id)
+            )
+            # Only links that did not exist yet count; the tag rows were just
+            # written by the upsert above, so this has to be its own statement.
+            linked_tag_uids = result.scalars().all()
+            if linked_tag_uids:
+                await session.exec(
+                    update(Tag)
+                    .where(uid_in(Tag.uid, linked_tag_uids))
+                    .values(book_count=Tag.book_count + 1)
+                    .execution_options(synchronize_session=False)
+                )
+
         await session.commit()
-        await session.refresh(book)
+        # New links change book counts, and new tags always come with one.
+        if linked_tag_uids:
+            await publish_tag_change()
+        await invalidate_cached_books(book_uid)
         return book
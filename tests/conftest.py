@@ -0,0 +1,73 @@
+import httpx
+import pytest
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def db_engine():
+    from src.config import Config
+
+    engine = create_async_engine(Config.DATABASE_URL, poolclass=NullPool)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+async def db_session(db_engine):
+    """
+    Session on one connection whose outer transaction is rolled back afterwards.
+    - Commits made by the code under test only release savepoints, so nothing
+      a test writes outlives it.
+    - Skips the test when the database is unreachable or not migrated.
+    """
+    try:
+        connection = await db_engine.connect()
+    except (OSError, DBAPIError) as exc:
+        pytest.skip(f"database unavailable: {exc}")
+
+    try:
+        await connection.exec_driver_sql("SELECT 1 FROM books LIMIT 0")
+    except DBAPIError as exc:
+        await connection.close()
+        pytest.skip(f"database is not migrated: {exc}")
+    await connection.rollback()
+
+    transaction = await connection.begin()
+    session = AsyncSession(
+        bind=connection,
+        expire_on_commit=False,
+        join_transaction_mode="create_savepoint",
+    )
+    try:
+        yield session
+    finally:
+        await session.close()
+        await transaction.rollback()
+        await connection.close()
+
+
+@pytest.fixture
+async def client(db_session):
+    from src import app
+    from src.db.main import get_session
+
+    async def get_test_session():
+        yield db_session
+
+    app.dependency_overrides[get_session] = get_test_session
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://localhost"
+        ) as client:
+            yield client
+    finally:
+        app.dependency_overrides.clear()
@@ -0,0 +1,102 @@
+import uuid
+from datetime import date
+import httpx
+import pytest
+from pydantic import ValidationError
+from sqlalchemy import event
+
+try:
+    from src import app
+    from src.auth.dependencies import get_current_user
+    from src.auth.schemas import UserSnapshotModel
+    from src.books.routes import access_token_bearer
+    from src.db.models import Book, BookTag, Review, Tag, User
+except ValidationError:
+    pytest.skip("application settings are not configured", allow_module_level=True)
+
+# List endpoints must not fan out into per-row loads of reviews or tags:
+# whatever the number of rows, they get this many statements at most.
+MAX_LIST_QUERIES = 1
+BOOK_COUNT = 5
+REVIEWS_PER_BOOK = 3
+TAGS_PER_BOOK = 2
+
+
+@pytest.fixture
+async def seeded_user(db_session):
+    """A user owning several books, each with reviews and tags."""
+    suffix = uuid.uuid4().hex[:8]
+    user = User(
+        username=f"lister-{suffix}",
+        email=f"lister-{suffix}@example.com",
+        first_name="List",
+        last_name="Tester",
+        role="user",
+        is_verified=True,
+        password_hash="unused",
+    )
+    tags = [Tag(name=f"list-{suffix}-{index}") for index in range(TAGS_PER_BOOK)]
+
+    db_session.add(user)
+    db_session.add_all(tags)
+    await db_session.flush()
+    books = [
+        Book(
+            title=f"Book {index}",
+            author="Author",
+            publisher="Publisher",
+            published_date=date(2020, 1, 1),
+            page_count=100,
+            genre="fiction",
+            price=10.0,
+            user_uid=user.uid,
+        )
+        for index in range(BOOK_COUNT)
+    ]
+    db_session.add_all(books)
+    await db_session.flush()
+    for book in books:
+        db_session.add_all(
+            Review(rating=4, review_text="Fine", user_uid=user.uid, book_uid=book.uid)
+            for _ in range(REVIEWS_PER_BOOK)
+        )
+        db_session.add_all(BookTag(book_id=book.uid, tag_id=tag.uid) for tag in tags)
+    await db_session.flush()
+    db_session.expunge_all()
+
+    app.dependency_overrides[access_token_bearer] = lambda: {
+        "user": {"email": user.email, "user_uid": str(user.uid)}
+    }
+    app.dependency_overrides[get_current_user] = lambda: UserSnapshotModel(
+        uid=user.uid, email=user.email, role=user.role, is_verified=True
+    )
+    return user
+
+
+async def count_queries(
+    client: httpx.AsyncClient, db_engine, path: str
+) -> int:
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        response = await client.get(path)
+    finally:
+        event.remove(db_engine.sync_engine, "before_cursor_execute", record)
+
+    assert response.status_code == 200, response.text
+    return len(statements)
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    "path", ["/api/v1/books/", "/api/v1/books/user/{user_uid}"]
+)
+async def test_list_endpoint_query_count_is_bounded(
+    client, db_engine, seeded_user, path
+):
+    path = path.format(user_uid=seeded_user.uid)
+    assert await count_queries(client, db_engine, path) <= MAX_LIST_QUERIES